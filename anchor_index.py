@@ -0,0 +1,200 @@
+import os
+import sys
+import glob
+import json
+
+from html_rewriter import Rule, rewrite_file, StreamingRewriter
+
+# --- Configuration ---
+PAGES_DIR = 'pages'
+SHELL_PATH = 'index.html'
+INDEX_SCRIPT_ID = 'anchor-index'
+DELIVERY_SCRIPT_ID = 'lecture-delivery'
+COURSE_NAV_SCRIPT_ID = 'course-nav'
+
+
+# --- Collection ---
+def read_inline_json(script_id, path=SHELL_PATH):
+    """ Returns the parsed content of <script id="..." type="application/json"> in the shell. """
+    rule = Rule(script_id, f'script#{script_id}', 'extract')
+    rewrite_file(path, [rule], dry_run=True)
+    if not rule.extracted:
+        return None
+    try:
+        return json.loads(rule.extracted[0][1].inner_html or '{}')
+    except ValueError:
+        return None
+
+
+def scan_html(html, page=''):
+    """
+    Returns (ids, section_ids, links) for one page fragment:
+    every id, the ids on <section> elements, and the in-page '#...' link targets.
+    """
+    id_rule = Rule('ids', '[id]', 'extract')
+    link_rule = Rule('links', 'a[href^="#"]', 'extract')
+    rewriter = StreamingRewriter([id_rule, link_rule], lambda chunk: None, page)
+    rewriter.feed(html)
+    rewriter.close()
+
+    ids = [el.attrs['id'] for _, el in id_rule.extracted]
+    section_ids = [el.attrs['id'] for _, el in id_rule.extracted if el.tag == 'section']
+    links = [el.attrs['href'][1:] for _, el in link_rule.extracted if len(el.attrs['href']) > 1]
+    return ids, section_ids, links
+
+
+def scan_html_page(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return scan_html(f.read(), os.path.basename(path))
+
+
+def scan_model(model):
+    """ Same as scan_html for a data-only lecture model (convert_lecture.py --data-only). """
+    ids = [block['id'] for block in model.get('blocks', []) if block.get('id')]
+    section_ids = [block['id'] for block in model.get('blocks', []) if block.get('type') == 'section']
+    links = []
+    for part in model.get('toc', []):
+        links.append(part['id'])
+        links.extend(sec['id'] for sec in part['sections'])
+    return ids, section_ids, links
+
+
+def scan_data_page(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return scan_model(json.load(f))
+
+
+def collect_shell_links(path=SHELL_PATH, nav=None):
+    """
+    Returns {page: [anchor targets]} for the nav tabs of the shell: the static #home-nav
+    markup and the lecture tabs listed in <script id="course-nav">. Tabs in `nav`
+    ({page: [[anchor, label], ...]}) replace the listed ones before they are written.
+    """
+    rule = Rule('home-nav', 'nav#home-nav a[href^="#"]', 'extract')
+    rewrite_file(path, [rule], dry_run=True)
+    links = {'home': [el.attrs['href'][1:] for _, el in rule.extracted]}
+    course_nav = {**(read_inline_json(COURSE_NAV_SCRIPT_ID, path) or {}), **(nav or {})}
+    for page, tabs in course_nav.items():
+        links.setdefault(page, []).extend(target for target, _ in tabs)
+    return links
+
+
+def collect_pages(pages_dir=PAGES_DIR, overrides=None):
+    """
+    Scans every page the SPA can load. Lectures delivered as data are read from their JSON
+    model, since that is what the browser renders. Pages in `overrides` ({page: scan result})
+    are taken as given, so a build can validate its output before writing it.
+    Returns {page: (ids, section_ids, links)}.
+    """
+    delivery = read_inline_json(DELIVERY_SCRIPT_ID) or {}
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+        page = os.path.splitext(os.path.basename(path))[0]
+        data_path = os.path.join(pages_dir, f"{page}.json")
+        if page in (overrides or {}):
+            pages[page] = overrides[page]
+        elif delivery.get(page) == 'data' and os.path.exists(data_path):
+            pages[page] = scan_data_page(data_path)
+        else:
+            pages[page] = scan_html_page(path)
+    for page in sorted(set(overrides or {}) - set(pages)):
+        pages[page] = overrides[page]  # First build of a new lecture
+    return pages
+
+
+# --- Index ---
+def build_anchor_index(pages, shell_links):
+    """
+    Builds the compact anchor -> page index: {"pages": [...], "anchors": {id: page position}}.
+    Only deep-link targets are indexed (<section> ids and ids some link points to), not widget ids.
+    Returns (index, errors, warnings).
+    """
+    errors = []
+    warnings = []
+    owners = {}  # id -> [pages]
+    for page, (ids, _, _) in pages.items():
+        for anchor_id in ids:
+            owners.setdefault(anchor_id, [])
+            if page not in owners[anchor_id]:
+                owners[anchor_id].append(page)
+
+    # Broken links: TOC links and nav tabs must resolve on the page they belong to
+    for page, (ids, _, links) in pages.items():
+        for target in sorted(set(links) - set(ids)):
+            errors.append(f"{page}: link to missing anchor '#{target}'")
+    for page, targets in shell_links.items():
+        page_ids = set(pages[page][0]) if page in pages else set()
+        for target in sorted(set(targets) - page_ids):
+            errors.append(f"{SHELL_PATH}: {page} nav tab to missing anchor '#{target}'")
+
+    # Link targets (nav tabs, TOC links) must be globally unique so '#<id>' deep links resolve
+    link_targets = {target for page_targets in shell_links.values() for target in page_targets}
+    for _, _, links in pages.values():
+        link_targets.update(links)
+    targets = set(link_targets)
+    for _, section_ids, _ in pages.values():
+        targets.update(section_ids)
+
+    page_names = list(pages)
+    anchors = {}
+    for anchor_id in sorted(targets & set(owners)):
+        found_in = owners[anchor_id]
+        if len(found_in) > 1:
+            if anchor_id in link_targets:
+                errors.append(f"link target '{anchor_id}' is used by {', '.join(found_in)}; rename one of them")
+            else:
+                # Still reachable as '#page/anchor'
+                warnings.append(f"'{anchor_id}' is used by {', '.join(found_in)}; use #<page>/{anchor_id}")
+            continue
+        anchors[anchor_id] = page_names.index(found_in[0])
+
+    return {'pages': page_names, 'anchors': anchors}, errors, warnings
+
+
+def write_anchor_index(index, path=SHELL_PATH):
+    """ Writes the index into the <script id="anchor-index"> block of the shell. """
+    def replace(element):
+        start_tag = element.outer_html[:element.outer_html.index('>') + 1]
+        return f"{start_tag}{json.dumps(index, ensure_ascii=False, separators=(',', ':'))}</script>"
+
+    rule = Rule(INDEX_SCRIPT_ID, f'script#{INDEX_SCRIPT_ID}', 'replace', replace)
+    matches, changed = rewrite_file(path, [rule])
+    if not matches[rule.name]:
+        print(f"[!] <script id=\"{INDEX_SCRIPT_ID}\"> not found in {path}")
+    return changed
+
+
+def validate_anchor_index(overrides=None, nav=None):
+    """
+    Builds the anchor index (see collect_pages / collect_shell_links for the overrides)
+    and prints its problems. Returns the index, or None if any link is broken.
+    """
+    index, errors, warnings = build_anchor_index(collect_pages(overrides=overrides), collect_shell_links(nav=nav))
+    for warning in warnings:
+        print(f"  [!] {warning}")
+    for error in errors:
+        print(f"  [ERROR] {error}")
+    return None if errors else index
+
+
+def update_anchor_index(index=None):
+    """ Rebuilds (unless given) and writes the anchor index. Returns False if any link is broken. """
+    index = index or validate_anchor_index()
+    if index is None:
+        return False
+
+    changed = write_anchor_index(index)
+    print(f"  {len(index['anchors'])} anchors across {len(index['pages'])} pages ({'updated' if changed else 'unchanged'})")
+    return True
+
+
+def main():
+    print("Building anchor index...")
+    if not update_anchor_index():
+        print("Anchor index failed: fix the broken links above.")
+        sys.exit(1)
+    print("Anchor index complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import math
+from html import escape
+
+from html_rewriter import Rule, rewrite_pages
+
+# --- Configuration ---
+# Colors that don't depend on the theme. Text/grid colors come from the .chart-* classes
+# in index.html (light + .dark variants), so the SVGs follow toggleDarkMode() without JS.
+BRAND = '#6366f1'   # Indigo
+RISK = '#f43f5e'    # Rose
+MUTED = '#94a3b8'   # Slate 400
+
+FONT_SIZE = 12
+
+# Static datasets (previously hard-coded in index.html's Chart.js setup)
+HOME_CHARTS = {
+    'revenueChart': lambda: render_bar_chart(
+        'revenueChart',
+        labels=['1개월', '2개월', '3개월', '4개월', '5개월'],
+        datasets=[{'label': '월 수익 (만원)', 'data': [7, 100, 1000, 3400, 10000], 'color': BRAND}],
+        min_ratio=0.02,  # Months 1-2 are < 1% of the axis; keep them visible
+        value_labels=True,
+        title='수익 성장 그래프 (J-Curve)',
+    ),
+    # The AI bar starts collapsed and is revealed by toggleEfficiencyMode()
+    'efficiencyChart': lambda: render_bar_chart(
+        'efficiencyChart',
+        labels=['제작 시간 (분)'],
+        datasets=[
+            {'label': '일반', 'data': [240], 'color': MUTED},
+            {'label': 'AI 워크플로우', 'data': [15], 'color': BRAND, 'toggle': True},
+        ],
+        horizontal=True,
+        max_value=250,
+        legend=True,
+        title='생산 vs 생산성 비교',
+    ),
+}
+
+LECTURE1_CHARTS = {
+    'toolRadarChart': lambda: render_radar_chart(
+        'toolRadarChart',
+        labels=['비용 효율성', '제작 속도', '퀄리티', '초보자 접근성', '자율성'],
+        datasets=[
+            {'label': 'Opal (오팔)', 'data': [90, 85, 70, 90, 60], 'color': BRAND},
+            {'label': 'Genspark', 'data': [40, 70, 95, 60, 80], 'color': RISK},
+        ],
+        max_value=100,
+        title='툴 성능 비교 (주관적 지표)',
+    ),
+}
+
+PAGE_CHARTS = {
+    'home.html': HOME_CHARTS,
+    'lecture1.html': LECTURE1_CHARTS,
+}
+
+
+# --- Helpers ---
+def _fmt(value):
+    """ Compact number formatting for SVG coordinates. """
+    return f"{value:.1f}".rstrip('0').rstrip('.')
+
+
+def _nice_max(value):
+    """ Rounds an axis maximum up to 1/2/5 x 10^n. """
+    if value <= 0:
+        return 1
+    exponent = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * exponent:
+            return step * exponent
+    return 10 * exponent
+
+
+def _format_tick(value):
+    return f"{value:,.0f}" if value >= 1 else _fmt(value)
+
+
+def _svg_open(chart_id, width, height, title):
+    id_attr = f' id="{escape(chart_id)}"' if chart_id else ''
+    return (
+        f'<svg{id_attr} class="chart-svg" viewBox="0 0 {width} {height}" role="img" '
+        f'aria-label="{escape(title)}" xmlns="http://www.w3.org/2000/svg" font-size="{FONT_SIZE}">'
+        f'<title>{escape(title)}</title>'
+    )
+
+
+def _legend(datasets, width, y=14):
+    """ Centered legend row: colored swatch + label per dataset. """
+    items = []
+    widths = [16 + len(ds['label']) * 8 + 16 for ds in datasets]
+    x = (width - sum(widths)) / 2
+    for ds, w in zip(datasets, widths):
+        items.append(
+            f'<rect x="{_fmt(x)}" y="{y - 9}" width="12" height="12" rx="2" fill="{ds["color"]}"/>'
+            f'<text x="{_fmt(x + 16)}" y="{y + 1}" class="chart-text">{escape(ds["label"])}</text>'
+        )
+        x += w
+    return f'<g class="chart-legend">{"".join(items)}</g>'
+
+
+# --- Bar / Stacked Bar ---
+def render_bar_chart(chart_id, labels, datasets, horizontal=False, stacked=False, max_value=None,
+                     legend=False, value_axis=True, min_ratio=0.0, value_labels=False, title='', width=600, height=300):
+    """
+    Renders a (grouped or stacked) bar chart as inline SVG.
+
+    datasets: [{'label': str, 'data': [number per label], 'color': css color,
+                'colors': optional per-bar colors, 'toggle': bool}]
+    Bars of datasets with 'toggle' start collapsed (class chart-toggle) and are shown by
+    adding the 'is-on' class to the <svg>.
+    value_axis=False hides the value grid/ticks; min_ratio keeps tiny values visible.
+    value_labels=True prints each value at the end of its bar (non-stacked charts).
+    """
+    if stacked:
+        totals = [sum(ds['data'][i] for ds in datasets) for i in range(len(labels))]
+        data_max = max(totals) if totals else 0
+    else:
+        data_max = max((v for ds in datasets for v in ds['data']), default=0)
+    axis_max = max_value or _nice_max(data_max)
+
+    top = 30 if legend else (24 if value_labels and not horizontal else 12)
+    left = 90 if horizontal else 56
+    right = 16
+    bottom = 28 if (value_axis or not horizontal) else 4
+    plot_w = width - left - right
+    plot_h = height - top - bottom
+
+    parts = [_svg_open(chart_id, width, height, title)]
+    if legend:
+        parts.append(_legend(datasets, width))
+
+    # Value axis grid + ticks
+    ticks = 5
+    for t in range(ticks + 1 if value_axis else 0):
+        value = axis_max * t / ticks
+        if horizontal:
+            x = left + plot_w * t / ticks
+            parts.append(f'<line x1="{_fmt(x)}" y1="{top}" x2="{_fmt(x)}" y2="{top + plot_h}" class="chart-grid"/>')
+            parts.append(f'<text x="{_fmt(x)}" y="{height - 8}" text-anchor="middle" class="chart-text">{_format_tick(value)}</text>')
+        else:
+            y = top + plot_h - plot_h * t / ticks
+            parts.append(f'<line x1="{left}" y1="{_fmt(y)}" x2="{left + plot_w}" y2="{_fmt(y)}" class="chart-grid"/>')
+            parts.append(f'<text x="{left - 8}" y="{_fmt(y + 4)}" text-anchor="end" class="chart-text">{_format_tick(value)}</text>')
+
+    # Bars
+    band = (plot_h if horizontal else plot_w) / max(len(labels), 1)
+    group = band * 0.7
+    bar_size = group if stacked else group / max(len(datasets), 1)
+
+    for i, label in enumerate(labels):
+        band_start = (top if horizontal else left) + band * i
+        offset = 0.0
+        for d, ds in enumerate(datasets):
+            value = ds['data'][i]
+            ratio = max(min_ratio, min(value, axis_max) / axis_max)
+            length = (plot_w if horizontal else plot_h) * ratio
+            pos = band_start + (band - group) / 2 + (0 if stacked else bar_size * d)
+            color = ds['colors'][i] if 'colors' in ds else ds['color']
+            cls = 'chart-bar chart-toggle' if ds.get('toggle') else 'chart-bar'
+            tooltip = f'<title>{escape(ds["label"])}: {_format_tick(value)}</title>'
+
+            if horizontal:
+                x = left + offset
+                parts.append(
+                    f'<rect x="{_fmt(x)}" y="{_fmt(pos)}" width="{_fmt(length)}" height="{_fmt(bar_size)}" rx="6" '
+                    f'fill="{color}" class="{cls}" data-value="{_fmt(value)}">{tooltip}</rect>'
+                )
+            else:
+                y = top + plot_h - offset - length
+                parts.append(
+                    f'<rect x="{_fmt(pos)}" y="{_fmt(y)}" width="{_fmt(bar_size)}" height="{_fmt(length)}" rx="4" '
+                    f'fill="{color}" class="{cls}" data-value="{_fmt(value)}">{tooltip}</rect>'
+                )
+            if value_labels and not stacked:
+                if horizontal:
+                    parts.append(f'<text x="{_fmt(left + length + 6)}" y="{_fmt(pos + bar_size / 2 + 4)}" class="chart-text">{_format_tick(value)}</text>')
+                else:
+                    parts.append(f'<text x="{_fmt(pos + bar_size / 2)}" y="{_fmt(y - 6)}" text-anchor="middle" class="chart-text">{_format_tick(value)}</text>')
+            if stacked:
+                offset += length
+
+        # Category labels
+        center = band_start + band / 2
+        if horizontal:
+            parts.append(f'<text x="{left - 8}" y="{_fmt(center + 4)}" text-anchor="end" class="chart-text">{escape(label)}</text>')
+        else:
+            parts.append(f'<text x="{_fmt(center)}" y="{height - 8}" text-anchor="middle" class="chart-text">{escape(label)}</text>')
+
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+def render_stacked_bar_chart(chart_id, labels, datasets, **options):
+    return render_bar_chart(chart_id, labels, datasets, stacked=True, **options)
+
+
+# --- Radar ---
+def render_radar_chart(chart_id, labels, datasets, max_value=100, levels=5, title='', width=400, height=320):
+    """
+    Renders a radar chart as inline SVG (grid rings, axis lines, one filled polygon per dataset).
+    """
+    legend_h = 24
+    cx = width / 2
+    cy = legend_h + (height - legend_h) / 2
+    radius = (height - legend_h) / 2 - 28
+    count = len(labels)
+
+    def point(i, ratio):
+        angle = -math.pi / 2 + 2 * math.pi * i / count
+        return cx + radius * ratio * math.cos(angle), cy + radius * ratio * math.sin(angle)
+
+    parts = [_svg_open(chart_id, width, height, title), _legend(datasets, width)]
+
+    # Grid rings + angle lines
+    for level in range(1, levels + 1):
+        ring = ' '.join(f"{_fmt(x)},{_fmt(y)}" for x, y in (point(i, level / levels) for i in range(count)))
+        parts.append(f'<polygon points="{ring}" fill="none" class="chart-grid"/>')
+    for i in range(count):
+        x, y = point(i, 1)
+        parts.append(f'<line x1="{_fmt(cx)}" y1="{_fmt(cy)}" x2="{_fmt(x)}" y2="{_fmt(y)}" class="chart-grid"/>')
+
+    # Point labels
+    for i, label in enumerate(labels):
+        x, y = point(i, 1.14)
+        anchor = 'middle' if abs(x - cx) < 1 else ('start' if x > cx else 'end')
+        parts.append(f'<text x="{_fmt(x)}" y="{_fmt(y + 4)}" text-anchor="{anchor}" class="chart-text">{escape(label)}</text>')
+
+    # Datasets
+    for ds in datasets:
+        pts = [point(i, min(v, max_value) / max_value) for i, v in enumerate(ds['data'])]
+        shape = ' '.join(f"{_fmt(x)},{_fmt(y)}" for x, y in pts)
+        parts.append(
+            f'<polygon points="{shape}" fill="{ds["color"]}" fill-opacity="0.2" stroke="{ds["color"]}" stroke-width="3">'
+            f'<title>{escape(ds["label"])}</title></polygon>'
+        )
+        for (x, y), value in zip(pts, ds['data']):
+            parts.append(
+                f'<circle cx="{_fmt(x)}" cy="{_fmt(y)}" r="3.5" fill="{ds["color"]}" stroke="#fff" stroke-width="1">'
+                f'<title>{escape(ds["label"])}: {value}</title></circle>'
+            )
+
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+# --- Build Step ---
+def build_rules():
+    """ One replace rule per chart id; matches the original <canvas> or a previously built <svg>. """
+    rules = []
+    for page, charts in PAGE_CHARTS.items():
+        for chart_id, render in charts.items():
+            rules.append(Rule(f'chart:{chart_id}', f'#{chart_id}', 'replace', lambda el, render=render: render()))
+    return rules
+
+
+def main():
+    print("Rendering static SVG charts...")
+    rewrite_pages(build_rules())
+    print("Charts complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,43 @@ import json
 import re
 import os
 import glob
+import hashlib
+import argparse
+import subprocess
 from pathlib import Path
+from html.parser import HTMLParser
+
+from render_cache import SectionRenderCache, make_cache_key
+from html_rewriter import Rule, rewrite_file
+import charts
+import prerender
+from anchor_index import validate_anchor_index, update_anchor_index, scan_html, scan_model, COURSE_NAV_SCRIPT_ID
 
 # --- Configuration ---
 DATA_DIR = 'data'
 PAGES_DIR = 'pages'
 OUTPUT_FILENAME_PATTERN = 'lecture{}.html'
+DATA_OUTPUT_FILENAME_PATTERN = 'lecture{}.json'
+SHELL_PATH = 'index.html'
+RENDERER_JS_PATH = os.path.join('js', 'lecture_renderer.js')
+DATA_MODEL_VERSION = 2  # 2: sections carry their anchor 'id'
+
+# Bump when the section markup changes in a way the source fingerprint below can't see
+# (e.g. a change in an imported helper). Edits to this file invalidate the cache automatically.
+RENDERER_VERSION = '1'
+
+# --- DOM Budget (--dom-budget) ---
+DOM_NODE_BUDGET = 1500  # Element nodes per lecture page; reported always, enforced with --dom-budget / --check-budget
+OPEN_SECTIONS = 6       # Budget mode: sections after the first N start collapsed (body in a <template>)
+OPEN_CARDS = 2          # Budget mode: cards after the first N of a section start collapsed
+
+# --- Anchors ---
+# Globally unique across lectures, so a URL hash maps to exactly one page (see anchor_index.py)
+def part_anchor_id(lec_num, part_number):
+    return f"lec{lec_num}-part-{part_number}"
+
+def section_anchor_id(lec_num, index):
+    return f"lec{lec_num}-sec-{index}"
 
 # --- Text Cleaning Rules ---
 # --- Text Cleaning Rules ---
@@ -75,58 +106,23 @@ def extract_money_values(text):
         
     return values
 
-def generate_css_chart(money_data):
-    if not money_data:
-        return ""
-        
-    # Sort by value
-    sorted_data = sorted(money_data, key=lambda x: x['value'])
-    max_val = sorted_data[-1]['value']
-    
-    html = f"""
-    <div class="mt-6 mb-4 bg-gray-50 dark:bg-gray-800 rounded-lg p-4 border border-gray-100 dark:border-gray-700">
-        <div class="flex items-center mb-4">
-            <div class="w-8 h-8 rounded-full bg-emerald-100 dark:bg-emerald-900/30 flex items-center justify-center mr-3">
-                <i class="fas fa-chart-line text-emerald-600 dark:text-emerald-400"></i>
-            </div>
-            <h4 class="text-sm font-bold text-gray-800 dark:text-gray-200">수익/비용 시뮬레이션</h4>
-        </div>
-        <div class="space-y-3">
-    """
-    
-    for item in sorted_data:
-        # Calculate percentage (prevent 0%)
-        percent = max(10, (item['value'] / max_val) * 100)
-        is_max = (item['value'] == max_val)
-        bar_color = "bg-emerald-500" if is_max else "bg-gray-300 dark:bg-gray-600"
-        text_cls = "text-emerald-600 dark:text-emerald-400 font-bold" if is_max else "text-gray-600 dark:text-gray-300"
-        
-        html += f"""
-        <div class="relative">
-            <div class="flex justify-between text-xs mb-1">
-                <span class="font-medium {text_cls}">{item['label']}</span>
-            </div>
-            <div class="w-full bg-gray-200 dark:bg-gray-700 rounded-full h-2.5">
-                <div class="{bar_color} h-2.5 rounded-full transition-all duration-1000" style="width: {percent}%"></div>
-            </div>
-        </div>
-        """
-        
-    html += """
-        </div>
-    </div>
-    """
-    return html
-
 # --- HTML Generation Helpers ---
 # --- Rendering Components ---
 
 # --- Rendering Components (Neon/Dark Mode Style) ---
 
-def get_card_theme(title):
+# Theme per semantic card category: (border_color, text_color, icon, bg_hue, title_gradient)
+CARD_THEMES = {
+    'warning': ("border-rose-600", "text-rose-500", "fa-ban", "bg-rose-900/10", "from-rose-500 to-red-500"),
+    'success': ("border-emerald-500", "text-emerald-400", "fa-bullseye", "bg-emerald-900/10", "from-emerald-400 to-green-400"),
+    'tip': ("border-blue-500", "text-blue-400", "fa-lightbulb", "bg-blue-900/10", "from-blue-400 to-cyan-400"),
+    'tool': ("border-indigo-500", "text-indigo-400", "fa-robot", "bg-indigo-900/10", "from-indigo-400 to-purple-400"),
+    'default': ("border-gray-700", "text-gray-300", "fa-cube", "bg-gray-800", "from-gray-200 to-gray-400"),
+}
+
+def get_card_category(title):
     """
-    Returns (border_color, text_color, icon, bg_hue, title_gradient) based on title keywords.
-    Matches the user's reference image style.
+    Returns the CARD_THEMES key for a card title, based on title keywords.
     """
     t = title.lower()
     
@@ -134,33 +130,55 @@ def get_card_theme(title):
     
     # 1. Warning/Danger (Red)
     if any(x in t for x in ["경고", "금지", "주의", "trash", "쓰레기", "안되는", "실패", "절대"]):
-        return "border-rose-600", "text-rose-500", "fa-ban", "bg-rose-900/10", "from-rose-500 to-red-500"
+        return 'warning'
         
     # 2. Success/Profit/Goal (Green)
     elif any(x in t for x in ["목표", "성공", "달성", "생산성", "속도", "돈", "수익", "매출", "1억"]):
-        return "border-emerald-500", "text-emerald-400", "fa-bullseye", "bg-emerald-900/10", "from-emerald-400 to-green-400"
+        return 'success'
         
     # 3. Tips/Deep Dive/Structure (Blue/Amber)
     elif any(x in t for x in ["tip", "팁", "노하우", "해결책", "비결", "핵심", "전략"]):
-        return "border-blue-500", "text-blue-400", "fa-lightbulb", "bg-blue-900/10", "from-blue-400 to-cyan-400"
+        return 'tip'
     
     # 4. Tools/Tech/AI (Purple - Generic)
     elif any(x in t for x in ["ai", "툴", "도구", "업무", "시스템", "자동화", "역할", "팀", "직원"]):
-        return "border-indigo-500", "text-indigo-400", "fa-robot", "bg-indigo-900/10", "from-indigo-400 to-purple-400"
+        return 'tool'
     
     # Default
-    return "border-gray-700", "text-gray-300", "fa-cube", "bg-gray-800", "from-gray-200 to-gray-400"
+    return 'default'
 
-def render_alert_box(title, content_list):
+def get_card_theme(title):
     """
-    Renders the top 'Warning/Insight' box (Red/Blue block).
-    Matches the reference image's Red Warning Box style.
+    Returns (border_color, text_color, icon, bg_hue, title_gradient) based on title keywords.
+    Matches the user's reference image style.
+    """
+    return CARD_THEMES[get_card_category(title)]
+
+def parse_alert_box(title, content_list):
+    """
+    Parses the top 'Warning/Insight' box into its data model:
+    {'type': 'alert', 'title': ..., 'warning': bool, 'paragraphs': [...]}
     """
     clean_tit = title.replace('📌', '').replace('💡', '').strip()
     
     is_warning = "경고" in clean_tit or "trash" in clean_tit.lower() or "금지" in clean_tit
+
+    paragraphs = []
+    for c in content_list:
+        cleaned = clean_text(c)
+        if not cleaned: continue
+        paragraphs.append(cleaned)
+
+    return {'type': 'alert', 'title': clean_tit, 'warning': is_warning, 'paragraphs': paragraphs}
+
+def render_alert_model(alert):
+    """
+    Renders the top 'Warning/Insight' box (Red/Blue block).
+    Matches the reference image's Red Warning Box style.
+    """
+    clean_tit = alert['title']
     
-    if is_warning:
+    if alert['warning']:
          # Strong Red Box
          bg_cls = "bg-[#7f1d1d] border-red-900" 
          icon = "fa-exclamation-triangle"
@@ -174,16 +192,16 @@ def render_alert_box(title, content_list):
          text_col = "text-slate-300"
 
     full_text = ""
-    for c in content_list:
-        cleaned = clean_text(c)
-        if not cleaned: continue
+    for cleaned in alert['paragraphs']:
         # Highlight logic
         cleaned = re.sub(r'<mark>(.*?)</mark>', r'<span class="font-bold underline Decoration-2">\1</span>', cleaned)
         cleaned = re.sub(r'<strong>(.*?)</strong>', r'<span class="font-bold text-white">\1</span>', cleaned)
         full_text += f"<p class='{text_col} leading-relaxed mb-2 last:mb-0'>{cleaned}</p>"
 
+    id_attr = f' id="{alert["id"]}"' if alert.get('id') else ''
+
     return f"""
-    <div class="{bg_cls} rounded-xl p-8 border mb-10 shadow-lg relative overflow-hidden">
+    <div{id_attr} class="{bg_cls} rounded-xl p-8 border mb-10 shadow-lg relative overflow-hidden">
         <h3 class="text-2xl font-bold {tit_col} mb-4 flex items-center">
             <i class="fas {icon} mr-3"></i>{clean_tit}
         </h3>
@@ -193,16 +211,18 @@ def render_alert_box(title, content_list):
     </div>
     """
 
-def render_neon_card(title, items):
+def render_alert_box(title, content_list):
+    return render_alert_model(parse_alert_box(title, content_list))
+
+def parse_neon_card(title, items):
     """
-    Smart Card Renderer.
+    Smart Card Parser.
     Parses content to detect:
     - Subtitles (Role: ...)
     - Sections (Why? Features)
     - Side Boxes (Tips, Strategies)
+    Returns the card's data model; empty fields are omitted to keep data-only output compact.
     """
-    border_col, text_col, icon, bg_col, gradient_col = get_card_theme(title)
-    
     # Internal Organization
     subtitle = ""
     main_section_title = ""
@@ -243,6 +263,26 @@ def render_neon_card(title, items):
             box_section['items'].append(cleaned)
         else:
             main_items.append(cleaned)
+
+    card = {'title': title, 'theme': get_card_category(title), 'items': main_items}
+    if subtitle:
+        card['role'] = subtitle
+    if main_section_title:
+        card['heading'] = main_section_title
+    if box_section:
+        card['box'] = box_section
+    return card
+
+def render_card_model(card):
+    """
+    Renders a parsed card (see parse_neon_card) with the Neon layout.
+    """
+    border_col, text_col, icon, bg_col, gradient_col = CARD_THEMES[card['theme']]
+    title = card['title']
+    subtitle = card.get('role', '')
+    main_section_title = card.get('heading', '')
+    main_items = card['items']
+    box_section = card.get('box')
             
     # --- HTML Rendering ---
     
@@ -312,18 +352,61 @@ def render_neon_card(title, items):
     </div>
     """
 
-def render_section(section_data, index):
+def render_neon_card(title, items):
+    return render_card_model(parse_neon_card(title, items))
+
+def render_compact_card_model(card):
     """
-    Renders Level 1 Section using the Neon Layout.
+    DOM-budget variant of render_card_model: one <article> with the header, list and box as
+    direct children (native list markers instead of bullet spans, no grid/column wrappers).
+    Collapsed cards keep only the header live; the body sits in an inert <template>
+    until expandCard() in index.html swaps it in.
+    """
+    border_col, text_col, icon, bg_col, gradient_col = CARD_THEMES[card['theme']]
+    box_section = card.get('box')
+
+    header_html = f'<h4 class="text-xl font-bold text-gray-100 mb-4"><i class="fas {icon} {text_col} mr-3"></i>{card["title"]}</h4>'
+    if card.get('role'):
+        header_html += f'<p class="text-sm {text_col} font-medium -mt-3 mb-4">역할: {card["role"]}</p>'
+
+    body_html = ""
+    if card.get('heading'):
+        body_html += f'<h5 class="text-md font-bold {text_col} mb-3">{card["heading"]}</h5>'
+    body_html += '<ul class="list-disc pl-5 space-y-2 text-gray-400 text-sm leading-relaxed marker:text-gray-500">'
+    for mi in card['items']:
+        mi = re.sub(r'<strong>(.*?)</strong>', r'<span class="text-gray-200 font-bold">\1</span>', mi)
+        body_html += f'<li>{mi}</li>'
+    body_html += '</ul>'
+
+    if box_section:
+        body_html += f'<div class="bg-gray-800/80 rounded-lg p-5 border border-gray-700 mt-4"><h5 class="text-sm font-bold {text_col} mb-3">{box_section["title"]}</h5><ul class="space-y-2 text-gray-400 text-sm">'
+        for bi in box_section['items']:
+            bi = re.sub(r'<strong>(.*?)</strong>', r'<span class="text-gray-200 font-bold">\1</span>', bi)
+            body_html += f'<li>{bi}</li>'
+        body_html += '</ul></div>'
+
+    if card.get('collapsed'):
+        count = len(card['items']) + (len(box_section['items']) if box_section else 0)
+        body_html = (f'<template>{body_html}</template>'
+                     f'<button type="button" onclick="expandCard(this)" class="text-sm font-bold {text_col} hover:underline">자세히 보기 ({count})</button>')
+
+    return f'<article class="bg-[#1e293b] rounded-xl p-6 border {border_col} shadow-xl">{header_html}{body_html}</article>'
+
+def parse_section(section_data, index, anchor_id, budget=None):
+    """
+    Parses a Level 1 Section into its data model: either an alert box model
+    or {'type': 'section', 'id': ..., 'index': ..., 'title': ..., 'intro': [...], 'cards': [...]}.
+    Both carry the section's anchor id, which TOC links point to.
     """
     title = clean_text(section_data.get('title', ''))
     title = re.sub(r'<mark>(.*?)</mark>', r'<strong>\1</strong>', title)
     
     # Insight Block Check (Top Level Warning/Quote)
     if any(x in title for x in ['📌', '💡']):
-        return render_alert_box(title, section_data.get('content', []))
+        alert = parse_alert_box(title, section_data.get('content', []))
+        alert['id'] = anchor_id
+        return alert
 
-    section_id = f"lecture-part-{index}"
     content_raw_list = section_data.get('content', [])
 
     # Grouping Logic (Parse into Cards)
@@ -348,16 +431,48 @@ def render_section(section_data, index):
         else:
              loose_content.append(cleaned)
 
+    section = {
+        'type': 'section',
+        'id': anchor_id,
+        'index': index,
+        'title': title,
+        'intro': loose_content,
+        'cards': [parse_neon_card(card['title'], card['items']) for card in cards_data],
+    }
+
+    # DOM-budget mode: compact markup; sections past the first N and cards past the first M
+    # of a section start collapsed
+    if budget is not None:
+        section['compact'] = True
+        if index >= budget['open_sections']:
+            section['collapsed'] = True
+        for card in section['cards'][budget['open_cards']:]:
+            card['collapsed'] = True
+    return section
+
+def render_section_model(section):
+    """
+    Renders a parsed section (see parse_section) using the Neon Layout.
+    """
+    if section['type'] == 'alert':
+        return render_alert_model(section)
+    if section.get('compact'):
+        return render_compact_section_model(section)
+
+    index = section['index']
+    title = section['title']
+    section_id = section['id']
+
     # HTML Assembly
     intro_html = ""
-    for lc in loose_content:
+    for lc in section['intro']:
         # Style loose text as "Lead Paragraphs"
         lc = re.sub(r'<mark>(.*?)</mark>', r'<span class="text-brand font-bold">\1</span>', lc)
         intro_html += f'<p class="text-gray-400 text-lg leading-relaxed mb-6 pl-4 border-l-2 border-gray-700">{lc}</p>'
 
     inner_cards = ""
-    for card in cards_data:
-        inner_cards += render_neon_card(card['title'], card['items'])
+    for card in section['cards']:
+        inner_cards += render_card_model(card)
         
     return f"""
     <section id="{section_id}" class="max-w-7xl mx-auto mb-20 pt-10 border-t border-gray-800">
@@ -376,19 +491,76 @@ def render_section(section_data, index):
     </section>
     """
 
+def render_compact_section_model(section):
+    """
+    DOM-budget variant of render_section_model. Every section but the first gets the
+    cv-auto class (content-visibility: auto in index.html), so offscreen sections skip
+    layout and paint until they are scrolled near. Collapsed sections keep their header
+    (and anchor) live and ship the body in a <template>.
+    """
+    lazy_cls = 'cv-auto ' if section['index'] > 0 else ''
+
+    intro_html = ""
+    for lc in section['intro']:
+        lc = re.sub(r'<mark>(.*?)</mark>', r'<span class="text-brand font-bold">\1</span>', lc)
+        intro_html += f'<p class="text-gray-400 text-lg leading-relaxed mb-6 pl-4 border-l-2 border-gray-700">{lc}</p>'
+
+    inner_cards = ''.join(render_compact_card_model(card) for card in section['cards'])
+
+    body_html = f'{intro_html}<div class="grid grid-cols-1 md:grid-cols-2 gap-6">{inner_cards}</div>'
+    if section.get('collapsed'):
+        body_html = (f'<template>{body_html}</template>'
+                     f'<button type="button" onclick="expandCard(this)" class="text-sm font-bold text-brand hover:underline">펼치기 (카드 {len(section["cards"])}개)</button>')
+
+    return (f'<section id="{section["id"]}" class="{lazy_cls}max-w-7xl mx-auto mb-20 pt-10 border-t border-gray-800">'
+            f'<span class="text-xs font-bold text-gray-500 uppercase tracking-widest mb-2 block">Part {section["index"] + 1}</span>'
+            f'<h2 class="text-3xl md:text-4xl font-black text-white mb-10 tracking-tight">{section["title"]}</h2>'
+            f'{body_html}</section>')
+
+def render_section(section_data, index, anchor_id, budget=None):
+    """
+    Renders Level 1 Section using the Neon Layout.
+    """
+    return render_section_model(parse_section(section_data, index, anchor_id, budget))
+
+def get_renderer_version():
+    """
+    Version string used in section cache keys: manual version + hash of this file's source,
+    so template/renderer edits never serve stale HTML.
+    """
+    with open(__file__, 'rb') as f:
+        source_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    return f"{RENDERER_VERSION}-{source_hash}"
+
+def render_section_cached(section_data, index, anchor_id, cache=None, version='', budget=None):
+    if cache is None:
+        return render_section(section_data, index, anchor_id, budget)
+
+    key = make_cache_key(section_data, index, anchor_id, version)
+    html = cache.get(key)
+    if html is None:
+        html = render_section(section_data, index, anchor_id, budget)
+        cache.put(key, html)
+    return html
+
 # --- Main Parsing Loop ---
 # --- Main Parsing Loop ---
-def process_lecture_data(lec_num, parts_files):
+NO_FILES_HTML = "<div class='text-center p-10'>데이터 파일이 없습니다.</div>"
+NO_CONTENT_HTML = "<div class='text-center text-gray-500 py-10'>변환할 콘텐츠가 없습니다. JSON 구조를 확인해주세요.</div>"
+
+def collect_lecture_blocks(lec_num, parts_files):
+    """
+    Pass 1: Reads the part files of one lecture and collects TOC metadata.
+    Returns (toc_structure, blocks, processed_count) where blocks is the page order of
+    ('anchor', part_id) and ('section', section_json, section_index, section_id) entries.
+    """
     # Pass 1: Collect Metadata for TOC
-    # Structure: [ {'part_title': '...', 'id': 'part-X', 'sections': [ {'id':..., 'title':...} ]}, ... ]
+    # Structure: [ {'part_title': '...', 'id': 'lecN-part-X', 'sections': [ {'id':..., 'title':...} ]}, ... ]
     toc_structure = []
-    
-    if not parts_files:
-        return "<div class='text-center p-10'>데이터 파일이 없습니다.</div>"
 
     parts_files.sort()
     
-    temp_sections = [] # Store HTML chunks
+    blocks = [] # Page order of anchors and sections
     processed_count = 0
     section_index = 0
     
@@ -403,7 +575,7 @@ def process_lecture_data(lec_num, parts_files):
                 else:
                      part_title = os.path.splitext(filename)[0]
 
-            part_id = f"part-{i+1}"
+            part_id = part_anchor_id(lec_num, i + 1)
             
             # Start new Part Group
             current_part = {
@@ -416,8 +588,7 @@ def process_lecture_data(lec_num, parts_files):
                 data = json.load(f)
             
             # anchor for file
-            file_anchor_html = f'<div id="{part_id}" class="scroll-mt-32"></div>'
-            temp_sections.append(file_anchor_html)
+            blocks.append(('anchor', part_id))
 
             for item in data:
                 if item.get('type') == 'section':
@@ -439,14 +610,12 @@ def process_lecture_data(lec_num, parts_files):
                     elif "Section" in clean_tit and any(char.isdigit() for char in clean_tit):
                         is_valid_toc = False # Generic fallback name
                     
-                    sec_id = f"lecture-part-{section_index}"
+                    sec_id = section_anchor_id(lec_num, section_index)
                     
                     if is_valid_toc:
                         current_part['sections'].append({'id': sec_id, 'title': clean_tit})
                     
-                    # Store HTML
-                    html = render_section(item, section_index)
-                    temp_sections.append(html)
+                    blocks.append(('section', item, section_index, sec_id))
                     
                     section_index += 1
                     processed_count += 1
@@ -456,11 +625,16 @@ def process_lecture_data(lec_num, parts_files):
                     
         except Exception as e:
             print(f"Error reading {file_path}: {e}")
-            
-    if processed_count == 0:
-         return "<div class='text-center text-gray-500 py-10'>변환할 콘텐츠가 없습니다. JSON 구조를 확인해주세요.</div>"
 
-    # Generate Structured TOC HTML
+    return toc_structure, blocks, processed_count
+
+def render_part_anchor(part_id):
+    return f'<div id="{part_id}" class="scroll-mt-32"></div>'
+
+def render_toc(toc_structure):
+    """
+    Generate Structured TOC HTML
+    """
     # If a part has NO valid TOC sections, maybe we just show the Part Title?
     
     toc_html = """
@@ -509,43 +683,75 @@ def process_lecture_data(lec_num, parts_files):
     </div>
     """
     
-    full_html = toc_html
-    for html in temp_sections:
-        full_html += html
+    return toc_html
+
+def process_lecture_data(lec_num, parts_files, cache=None, budget=None):
+    if not parts_files:
+        return NO_FILES_HTML
+
+    toc_structure, blocks, processed_count = collect_lecture_blocks(lec_num, parts_files)
+    if processed_count == 0:
+         return NO_CONTENT_HTML
+
+    renderer_version = get_renderer_version() if cache is not None else ''
+    if budget is not None:
+        renderer_version += f"-open{budget['open_sections']}.{budget['open_cards']}"  # Budget markup is cached separately
+
+    full_html = render_toc(toc_structure)
+    for block in blocks:
+        if block[0] == 'anchor':
+            full_html += render_part_anchor(block[1])
+        else:
+            # Unchanged sections come from the render cache
+            full_html += render_section_cached(block[1], block[2], block[3], cache, renderer_version, budget)
         
     return full_html
 
+# --- Data-only Delivery ---
+def build_lecture_model(lec_num, parts_files, budget=None):
+    """
+    Builds the compact data model of one lecture page for data-only delivery.
+    js/lecture_renderer.js turns it into the same markup process_lecture_data produces.
+    """
+    model = {'version': DATA_MODEL_VERSION, 'lecture': lec_num}
+    if not parts_files:
+        model['message'] = NO_FILES_HTML
+        return model
 
-def main():
-    # 1. Group files by Lecture Number
-    all_files = glob.glob(os.path.join(DATA_DIR, '*.json'))
-    
-    lectures = {} 
-    
-    for f in all_files:
-        filename = os.path.basename(f)
-        match = re.search(r'(\d+)강', filename)
-        if match:
-            lec_num = int(match.group(1))
+    toc_structure, blocks, processed_count = collect_lecture_blocks(lec_num, parts_files)
+    if processed_count == 0:
+        model['message'] = NO_CONTENT_HTML
+        return model
+
+    model['toc'] = toc_structure
+    model['blocks'] = [
+        {'type': 'anchor', 'id': block[1]} if block[0] == 'anchor' else parse_section(block[1], block[2], block[3], budget)
+        for block in blocks
+    ]
+    return model
+
+def render_lecture_model(model):
+    """
+    Python twin of renderLecture() in js/lecture_renderer.js (used by prerender.py and the DOM budget report).
+    """
+    if 'message' in model:
+        return render_lecture_page(model['lecture'], model['message'])
+
+    content_html = render_toc(model['toc'])
+    for block in model['blocks']:
+        if block['type'] == 'anchor':
+            content_html += render_part_anchor(block['id'])
         else:
-            lec_num = 1
-            
-        if lec_num not in lectures:
-            lectures[lec_num] = []
-        lectures[lec_num].append(f)
-        
-    # 2. Process each lecture
-    for lec_num, files in lectures.items():
-        print(f"Processing Lecture {lec_num} with {len(files)} parts...")
-        
-        lecture_content_html = process_lecture_data(lec_num, files)
-        
-        # Navigation Extraction (Simple regex based on headers)
-        # We need to construct navigation links for the sidebar/topbar if possible, 
-        # but for now we just generate the content body.
-        # The main 'shortstobenz3.html' handles the nav via scroll spy if standard IDs are used.
-        
-        final_html = f"""
+            content_html += render_section_model(block)
+    return render_lecture_page(model['lecture'], content_html)
+
+def render_lecture_page(lec_num, lecture_content_html):
+    # Navigation Extraction (Simple regex based on headers)
+    # We need to construct navigation links for the sidebar/topbar if possible, 
+    # but for now we just generate the content body.
+    # The main 'shortstobenz3.html' handles the nav via scroll spy if standard IDs are used.
+    
+    return f"""
         <!-- Generated Lecture Content -->
         <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-12 animate-fade-in-up">
             <div class="text-center mb-20">
@@ -563,15 +769,273 @@ def main():
             </div>
         </div>
         """
+
+def render_lecture_js(model):
+    """
+    Runs js/lecture_renderer.js under Node and returns its markup for the model.
+    Returns None if Node is not installed.
+    """
+    script = (
+        "const r = require(process.argv[1]); let s = '';"
+        "process.stdin.setEncoding('utf8');"
+        "process.stdin.on('data', d => s += d).on('end', () => process.stdout.write(r.renderLecture(JSON.parse(s))));"
+    )
+    try:
+        result = subprocess.run(
+            ['node', '-e', script, os.path.abspath(RENDERER_JS_PATH)],
+            input=json.dumps(model, ensure_ascii=False).encode('utf-8'),
+            capture_output=True, check=True,
+        )
+    except FileNotFoundError:
+        return None
+    return result.stdout.decode('utf-8')
+
+def check_parity(lectures, budget=None):
+    """
+    Renders every lecture with the Python templates (HTML delivery) and with
+    js/lecture_renderer.js (data-only delivery) and compares the markup.
+    Returns False on any mismatch, or if Node is not available to run the JS renderer.
+    """
+    ok = True
+    for lec_num, files in sorted(lectures.items()):
+        expected = render_lecture_page(lec_num, process_lecture_data(lec_num, list(files), budget=budget))
+        actual = render_lecture_js(build_lecture_model(lec_num, list(files), budget))
+        if actual is None:
+            print("  [ERROR] node not found: the JS renderer can't be checked")
+            return False
+
+        if actual == expected:
+            print(f"  Lecture {lec_num}: identical ({len(expected)} chars)")
+            continue
+        ok = False
+        pos = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b), min(len(expected), len(actual)))
+        print(f"  Lecture {lec_num}: MISMATCH at char {pos}")
+        print(f"    html: {expected[max(0, pos - 60):pos + 60]!r}")
+        print(f"    js:   {actual[max(0, pos - 60):pos + 60]!r}")
+    return ok
+
+# --- DOM Budget ---
+class DomNodeCounter(HTMLParser):
+    """ Counts the element nodes innerHTML creates; <template> content is inert and not counted. """
+
+    def __init__(self):
+        super().__init__()
+        self.nodes = 0
+        self.template_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if not self.template_depth:
+            self.nodes += 1
+        if tag == 'template':
+            self.template_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == 'template' and self.template_depth:
+            self.template_depth -= 1
+
+def count_dom_nodes(html):
+    counter = DomNodeCounter()
+    counter.feed(html)
+    counter.close()
+    return counter.nodes
+
+def report_dom_budget(page_html, node_budget=DOM_NODE_BUDGET):
+    """ Prints the page's initial element count against the budget; returns True if it fits. """
+    nodes = count_dom_nodes(page_html)
+    status = "OK" if nodes <= node_budget else f"[!] over budget by {nodes - node_budget}"
+    print(f"  DOM: {nodes} element nodes (budget {node_budget}) {status}")
+    return nodes <= node_budget
+
+def check_dom_budget(lectures, budget, node_budget=DOM_NODE_BUDGET):
+    """ Renders every lecture in DOM-budget mode; returns False if any page is over the node budget. """
+    ok = True
+    for lec_num, files in sorted(lectures.items()):
+        print(f"  Lecture {lec_num}:")
+        page_html = render_lecture_page(lec_num, process_lecture_data(lec_num, list(files), budget=budget))
+        ok = report_dom_budget(page_html, node_budget) and ok
+    return ok
+
+def lecture_nav_tabs(toc_structure):
+    """ Lecture nav tabs ([anchor, label]) of a generated lecture: one per part anchor. """
+    tabs = []
+    for part in toc_structure:
+        match = re.match(r'\d+부', part['title'])
+        tabs.append([part['id'], match.group(0) if match else part['title']])
+    return tabs
+
+def update_course_nav(nav):
+    """
+    Writes the nav tabs of the built lectures into <script id="course-nav"> of index.html,
+    replacing the tabs of the hand-authored pages the build overwrote.
+    """
+    def merge(element):
+        try:
+            course_nav = json.loads(element.inner_html or '{}')
+        except ValueError:
+            course_nav = {}
+        course_nav.update(nav)
+        start_tag = element.outer_html[:element.outer_html.index('>') + 1]
+        return f"{start_tag}{json.dumps(course_nav, ensure_ascii=False, separators=(',', ':'))}</script>"
+
+    rule = Rule(COURSE_NAV_SCRIPT_ID, f'script#{COURSE_NAV_SCRIPT_ID}', 'replace', merge)
+    matches, changed = rewrite_file(SHELL_PATH, [rule])
+    if not matches[rule.name]:
+        print(f"[!] <script id=\"{COURSE_NAV_SCRIPT_ID}\"> not found in {SHELL_PATH}")
+
+def update_delivery_map(modes):
+    """
+    Records the delivery mode of each built lecture ('html' or 'data') in the
+    <script id="lecture-delivery"> block of index.html, which the SPA loaders read.
+    """
+    def merge(element):
+        try:
+            delivery = json.loads(element.inner_html or '{}')
+        except ValueError:
+            delivery = {}
+        delivery.update(modes)
+        start_tag = element.outer_html[:element.outer_html.index('>') + 1]
+        return f"{start_tag}{json.dumps(delivery, sort_keys=True)}</script>"
+
+    rule = Rule('lecture-delivery', 'script#lecture-delivery', 'replace', merge)
+    matches, changed = rewrite_file(SHELL_PATH, [rule])
+    if not matches[rule.name]:
+        print(f"[!] <script id=\"lecture-delivery\"> not found in {SHELL_PATH}")
+
+def build_lectures(lectures, args, cache, budget):
+    """
+    Renders every lecture in memory, checks the anchors of the result (TOC links, nav tabs)
+    and only then writes the pages and the index.html blocks, so a failed build leaves the
+    tree untouched.
+    """
+    # 2. Process each lecture
+    outputs = {}  # page -> (output_path, content)
+    scans = {}
+    nav = {}
+    over_budget = []
+    for lec_num, files in lectures.items():
+        print(f"Processing Lecture {lec_num} with {len(files)} parts...")
+        page = f"lecture{lec_num}"
+
+        if args.data_only:
+            model = build_lecture_model(lec_num, files, budget)
+            output_path = os.path.join(PAGES_DIR, DATA_OUTPUT_FILENAME_PATTERN.format(lec_num))
+            outputs[page] = (output_path, json.dumps(model, ensure_ascii=False, separators=(',', ':')))
+            scans[page] = scan_model(model)
+            nav[page] = lecture_nav_tabs(model.get('toc', []))
+            if not report_dom_budget(render_lecture_model(model), args.node_budget):
+                over_budget.append(page)
+            continue
+
+        lecture_content_html = process_lecture_data(lec_num, files, cache, budget)
         
-        output_path = os.path.join(PAGES_DIR, OUTPUT_FILENAME_PATTERN.format(lec_num))
-        os.makedirs(PAGES_DIR, exist_ok=True)
+        final_html = render_lecture_page(lec_num, lecture_content_html)
         
+        output_path = os.path.join(PAGES_DIR, OUTPUT_FILENAME_PATTERN.format(lec_num))
+        outputs[page] = (output_path, final_html)
+        scans[page] = scan_html(final_html, page)
+        nav[page] = lecture_nav_tabs(collect_lecture_blocks(lec_num, list(files))[0] if files else [])
+        if not report_dom_budget(final_html, args.node_budget):
+            over_budget.append(page)
+
+    # With --dom-budget the budget is a gate, not just a report
+    if budget is not None and over_budget:
+        print(f"Build aborted before writing: {', '.join(over_budget)} over the {args.node_budget}-node budget "
+              f"(lower --open-sections / --open-cards).")
+        raise SystemExit(1)
+
+    # Deep-link index over all pages; a TOC link to a missing anchor fails the build
+    print("Checking anchors...")
+    index = validate_anchor_index(overrides=scans, nav=nav)
+    if index is None:
+        print("Build aborted before writing: fix the broken links above.")
+        raise SystemExit(1)
+
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    for output_path, content in outputs.values():
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(final_html)
-            
+            f.write(content)
         print(f"Created {output_path}")
 
+    # Tell the SPA which format to fetch for each lecture, and which tabs it has
+    mode = 'data' if args.data_only else 'html'
+    update_delivery_map({page: mode for page in outputs})
+    update_course_nav(nav)
+
+    print("Updating anchor index...")
+    update_anchor_index(index)
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert lecture JSON files in data/ into pages/lecture{N}.html')
+    parser.add_argument('--no-cache', action='store_true', help='Render every section, ignoring the section render cache')
+    parser.add_argument('--clear-cache', action='store_true', help='Empty the section render cache before building')
+    parser.add_argument('--data-only', action='store_true',
+                        help=f'Write compact pages/lecture{{N}}.json rendered client-side by {RENDERER_JS_PATH} instead of HTML')
+    parser.add_argument('--check-parity', action='store_true',
+                        help='Check that data-only delivery renders the same markup as HTML delivery, then exit')
+    parser.add_argument('--dom-budget', action='store_true',
+                        help='Flatter card markup, collapsed cards in <template>, content-visibility on offscreen sections')
+    parser.add_argument('--open-cards', type=int, default=OPEN_CARDS,
+                        help=f'With --dom-budget: cards per section rendered expanded (default {OPEN_CARDS})')
+    parser.add_argument('--open-sections', type=int, default=OPEN_SECTIONS,
+                        help=f'With --dom-budget: sections rendered expanded before the rest collapse (default {OPEN_SECTIONS})')
+    parser.add_argument('--node-budget', type=int, default=DOM_NODE_BUDGET,
+                        help=f'Element nodes per page; with --dom-budget a page above it fails the build (default {DOM_NODE_BUDGET})')
+    parser.add_argument('--check-budget', action='store_true',
+                        help='Render every lecture with --dom-budget and fail if a page is over --node-budget, then exit')
+    args = parser.parse_args()
+    budget = {'open_sections': args.open_sections, 'open_cards': args.open_cards} if args.dom_budget else None
+
+    cache = None
+    if not args.no_cache and not args.data_only:
+        cache = SectionRenderCache()
+        if args.clear_cache:
+            cache.clear()
+
+    # 1. Group files by Lecture Number
+    all_files = glob.glob(os.path.join(DATA_DIR, '*.json'))
+    
+    lectures = {} 
+    
+    for f in all_files:
+        filename = os.path.basename(f)
+        match = re.search(r'(\d+)강', filename)
+        if match:
+            lec_num = int(match.group(1))
+        else:
+            lec_num = 1
+            
+        if lec_num not in lectures:
+            lectures[lec_num] = []
+        lectures[lec_num].append(f)
+        
+    if args.check_budget:
+        print("Checking the DOM budget...")
+        budget = budget or {'open_sections': args.open_sections, 'open_cards': args.open_cards}
+        if not check_dom_budget(lectures, budget, args.node_budget):
+            raise SystemExit(1)
+        print("DOM budget OK.")
+        return
+
+    if args.check_parity:
+        print("Checking data-only / HTML parity...")
+        if not check_parity(lectures, budget):
+            raise SystemExit(1)
+        print("Parity OK.")
+        return
+
+    try:
+        build_lectures(lectures, args, cache, budget)
+    finally:
+        # Sections rendered before a failed check are still valid cache entries
+        if cache is not None:
+            cache.save()
+            print(cache.summary())
+
+    # Static SVG charts go into the page placeholders, then the standalone course-*.html
+    # documents and sitemap.xml embed the shell and the pages just written
+    charts.main()
+    prerender.main()
+
     print("All conversions complete.")
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+import io
+import os
+import sys
+import gzip
+import json
+import time
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# --- Configuration ---
+DEFAULT_PORT = 8000
+TELEMETRY_PATH = '/__telemetry'
+TELEMETRY_DIR = 'telemetry'
+TELEMETRY_FILE = os.path.join(TELEMETRY_DIR, 'events.jsonl')
+MAX_BEACON_BYTES = 64 * 1024
+
+# Compressed when the client sends Accept-Encoding: gzip (like the production CDN does)
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml', 'application/xml')
+GZIP_LEVEL = 6
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Static file server (same as `python -m http.server`, plus keep-alive and gzip) and a
+    POST endpoint that collects the client telemetry beacons from index.html (perfTelemetry).
+    Conditional requests (If-Modified-Since -> 304) come from SimpleHTTPRequestHandler.
+    """
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive; every response carries a Content-Length
+    disable_nagle_algorithm = True  # Headers and body are separate writes; avoids 40ms delayed-ACK stalls
+    _gzip_cache = {}  # path -> (mtime, size, compressed bytes)
+
+    # --- gzip ---
+    def _accepts_gzip(self):
+        return 'gzip' in (self.headers.get('Accept-Encoding') or '')
+
+    def _compressed(self, path):
+        stat = os.stat(path)
+        cached = self._gzip_cache.get(path)
+        if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+            return cached[2]
+        with open(path, 'rb') as f:
+            body = gzip.compress(f.read(), GZIP_LEVEL)
+        self._gzip_cache[path] = (stat.st_mtime, stat.st_size, body)
+        return body
+
+    def send_head(self):
+        # The parent sends the headers (incl. 304 handling); only the 200 body is swapped
+        self._status = None
+        self._gzip_body = None
+        path = self.translate_path(self.path)
+        if self._accepts_gzip() and os.path.isfile(path) and self.guess_type(path).startswith(COMPRESSIBLE_TYPES):
+            self._gzip_body = self._compressed(path)
+
+        f = super().send_head()
+        if f is not None and self._gzip_body is not None and self._status == 200:
+            f.close()
+            return io.BytesIO(self._gzip_body)
+        return f
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword == 'Content-Length' and getattr(self, '_gzip_body', None) is not None and self._status == 200:
+            super().send_header('Content-Encoding', 'gzip')
+            super().send_header('Vary', 'Accept-Encoding')
+            value = str(len(self._gzip_body))
+        super().send_header(keyword, value)
+
+    def _reject_unread(self, code, message=None):
+        """ Error for a request whose body was not read: close so it isn't parsed as the next request. """
+        self.close_connection = True
+        self.send_error(code, message)
+
+    def do_POST(self):
+        if self.path.split('?')[0] != TELEMETRY_PATH:
+            self._reject_unread(404)
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length <= 0 or length > MAX_BEACON_BYTES:
+            self._reject_unread(413 if length > MAX_BEACON_BYTES else 400)
+            return
+
+        body = self.rfile.read(length)
+        try:
+            payload = json.loads(body.decode('utf-8'))
+            events = payload['events']
+            context = payload.get('context') or {}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.send_error(400, 'Invalid telemetry payload')
+            return
+        if not isinstance(events, list) or not isinstance(context, dict):
+            self.send_error(400, 'Invalid telemetry payload')
+            return
+
+        received = time.time()
+        os.makedirs(TELEMETRY_DIR, exist_ok=True)
+        with open(TELEMETRY_FILE, 'a', encoding='utf-8') as f:
+            for event in events:
+                if isinstance(event, dict):
+                    record = {**context, **event, 'received': received, 'client': self.client_address[0]}
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Beacons are frequent; keep the console for page requests.
+        # send_error() logs before self.path is set when the request line is malformed.
+        if TELEMETRY_PATH not in getattr(self, 'path', '') and not getattr(self.server, 'quiet', False):
+            super().log_message(format, *args)
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    server = ThreadingHTTPServer(('', port), DevRequestHandler)
+    server.quiet = '--quiet' in sys.argv  # load_test.py: no per-request log lines
+    print(f"Serving on http://localhost:{port}/index.html")
+    print(f"Telemetry: open http://localhost:{port}/index.html?telemetry=1 once (?telemetry=0 turns it off)")
+    print(f"  -> {TELEMETRY_FILE} (summarize with: python telemetry_report.py)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
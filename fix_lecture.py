@@ -1,18 +1,20 @@
-import re
-import os
+from html_rewriter import Rule, rewrite_pages
 
-file_path = r'c:\Users\blue2510\자체제작프로그램\ShortsToBenz3\pages\lecture1.html'
+# Removes the "Part N" eyebrow span above each generated section title:
+# <span class="text-xs font-bold text-gray-500 uppercase tracking-widest mb-2 block">Part 3</span>
+PART_SPAN_SELECTOR = 'span.text-xs.font-bold.text-gray-500.uppercase.tracking-widest.mb-2.block'
 
-with open(file_path, 'r', encoding='utf-8') as f:
-    content = f.read()
 
-# Pattern for the Part span
-# <span class="text-xs font-bold text-gray-500 uppercase tracking-widest mb-2 block">Part 3</span>
-pattern = r'<span class="text-xs font-bold text-gray-500 uppercase tracking-widest mb-2 block">\s*Part \d+\s*</span>'
+def build_rules():
+    return [
+        Rule('remove-part-span', PART_SPAN_SELECTOR, 'remove', text=r'^\s*Part \d+\s*$'),
+    ]
+
 
-new_content = re.sub(pattern, '', content)
+def main():
+    rewrite_pages(build_rules())
+    print("Successfully removed Part spans.")
 
-with open(file_path, 'w', encoding='utf-8') as f:
-    f.write(new_content)
 
-print("Successfully removed Part spans.")
+if __name__ == "__main__":
+    main()
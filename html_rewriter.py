@@ -0,0 +1,356 @@
+import os
+import re
+import glob
+import filecmp
+from html.parser import HTMLParser
+
+# --- Configuration ---
+PAGES_DIR = 'pages'
+CHUNK_SIZE = 64 * 1024  # Pages are streamed through the parser in chunks of this size
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+ACTIONS = ('remove', 'replace', 'wrap', 'extract')
+
+
+# --- Selectors ---
+# Supported syntax (enough for our generated markup):
+#   tag, #id, .class, [attr], [attr=value], [attr^=value], [attr*=value]
+#   compound: div.flex.flex-col   descendant: div.grid h4
+# Tailwind classes containing '.' must escape it: .mt-1\.5  (':' and '/' need no escaping)
+_COMPOUND_TOKEN = re.compile(
+    r'(?P<tag>^[a-zA-Z][a-zA-Z0-9-]*|^\*)'
+    r'|#(?P<id>(?:\\.|[^\s.#\[\\])+)'
+    r'|\.(?P<cls>(?:\\.|[^\s.#\[\\])+)'
+    r'|\[(?P<attr>[a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*(?:(?P<op>[\^*]?=)\s*["\']?(?P<val>[^"\'\]]*)["\']?)?\]'
+)
+
+
+def _unescape(value):
+    return re.sub(r'\\(.)', r'\1', value)
+
+
+def parse_compound(text):
+    """
+    Parses one compound selector (no spaces) into a dict:
+    {'tag': str|None, 'id': str|None, 'classes': set, 'attrs': [(name, op, value)]}
+    """
+    compound = {'tag': None, 'id': None, 'classes': set(), 'attrs': []}
+    pos = 0
+    while pos < len(text):
+        m = _COMPOUND_TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Invalid selector near '{text[pos:]}'")
+        if m.group('tag'):
+            compound['tag'] = None if m.group('tag') == '*' else m.group('tag').lower()
+        elif m.group('id'):
+            compound['id'] = _unescape(m.group('id'))
+        elif m.group('cls'):
+            compound['classes'].add(_unescape(m.group('cls')))
+        else:
+            compound['attrs'].append((m.group('attr').lower(), m.group('op'), m.group('val')))
+        pos = m.end()
+    return compound
+
+
+def parse_selector(selector):
+    """ Splits a descendant selector ('div.grid h4') into a list of compounds. """
+    parts = [p for p in re.split(r'(?<!\\)\s+', selector.strip()) if p]
+    if not parts:
+        raise ValueError("Empty selector")
+    return [parse_compound(p) for p in parts]
+
+
+def _match_compound(compound, tag, attrs):
+    if compound['tag'] and compound['tag'] != tag:
+        return False
+    if compound['id'] and attrs.get('id') != compound['id']:
+        return False
+    if compound['classes']:
+        classes = set((attrs.get('class') or '').split())
+        if not compound['classes'] <= classes:
+            return False
+    for name, op, value in compound['attrs']:
+        actual = attrs.get(name)
+        if actual is None:
+            return False
+        if op == '=' and actual != value:
+            return False
+        if op == '^=' and not actual.startswith(value):
+            return False
+        if op == '*=' and value not in actual:
+            return False
+    return True
+
+
+def match_selector(compounds, tag, attrs, ancestors):
+    """
+    ancestors: list of (tag, attrs) for the currently open elements, outermost first.
+    The last compound must match the element itself, the others any chain of ancestors.
+    """
+    if not _match_compound(compounds[-1], tag, attrs):
+        return False
+    remaining = compounds[:-1]
+    for anc_tag, anc_attrs in reversed(ancestors):
+        if not remaining:
+            break
+        if _match_compound(remaining[-1], anc_tag, anc_attrs):
+            remaining = remaining[:-1]
+    return not remaining
+
+
+# --- Rules ---
+class Rule:
+    """
+    A selector-style rewrite rule.
+
+    action:
+        'remove'  -> drop the matched element
+        'replace' -> emit `value` instead (str, or callable(element) -> str)
+        'wrap'    -> emit value[0] + element + value[1] (or callable(element) -> (before, after))
+        'extract' -> keep the element untouched and collect it in rule.extracted
+    text: optional regex the element's text content must match (re.search)
+    """
+
+    def __init__(self, name, selector, action, value=None, text=None):
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action '{action}' (expected one of {', '.join(ACTIONS)})")
+        self.name = name
+        self.selector = selector
+        self.compounds = parse_selector(selector)
+        self.action = action
+        self.value = value
+        self.text = re.compile(text) if isinstance(text, str) else text
+        self.extracted = []  # (page, Element) for 'extract' rules
+
+    def apply(self, element):
+        """ Returns the markup that replaces the captured element. """
+        if self.action == 'remove':
+            return ''
+        if self.action == 'replace':
+            return self.value(element) if callable(self.value) else self.value
+        if self.action == 'wrap':
+            before, after = self.value(element) if callable(self.value) else self.value
+            return f"{before}{element.outer_html}{after}"
+        self.extracted.append((element.page, element))
+        return element.outer_html
+
+
+class Element:
+    """ A matched element, captured from its start tag up to its end tag. """
+
+    def __init__(self, page, tag, attrs, outer_html, inner_html, text):
+        self.page = page
+        self.tag = tag
+        self.attrs = attrs
+        self.outer_html = outer_html
+        self.inner_html = inner_html
+        self.text = text
+
+    def __repr__(self):
+        return f"<Element {self.tag} id={self.attrs.get('id')!r} in {self.page}>"
+
+
+# --- Streaming Rewriter ---
+class _Capture:
+    def __init__(self, rules, tag, attrs, depth):
+        self.rules = rules
+        self.tag = tag
+        self.attrs = attrs
+        self.depth = depth  # Stack depth of the captured element
+        self.parts = []
+        self.text_parts = []
+        self.start_len = 0  # Length of the raw start tag, to slice out inner_html
+
+
+class StreamingRewriter(HTMLParser):
+    """
+    Single-pass rewriter: raw markup is copied to `write` as it is parsed.
+    Only elements matched by a rule are buffered (until their end tag), so memory is
+    bounded by the largest matched element instead of the page size.
+    """
+
+    def __init__(self, rules, write, page=''):
+        super().__init__(convert_charrefs=False)
+        self.rules = rules
+        self.write = write
+        self.page = page
+        self.stack = []     # [(tag, attrs)] for open elements
+        self.captures = []  # Nested captures, innermost last
+        self.matches = {rule.name: 0 for rule in rules}
+        self._pending_ref = False
+
+    # --- Output Plumbing ---
+    def _emit(self, raw, text=None):
+        if self.captures:
+            self.captures[-1].parts.append(raw)
+            if text is not None:
+                for capture in self.captures:
+                    capture.text_parts.append(text)
+        else:
+            self.write(raw)
+
+    def _finish_capture(self):
+        capture = self.captures.pop()
+        outer = ''.join(capture.parts)
+        end_tag = f"</{capture.tag}>" if capture.tag not in VOID_TAGS and outer.endswith(f"</{capture.tag}>") else ''
+        inner = outer[capture.start_len:len(outer) - len(end_tag)]
+        element = Element(self.page, capture.tag, capture.attrs, outer, inner, ''.join(capture.text_parts))
+
+        html = outer
+        for rule in capture.rules:
+            if rule.text and not rule.text.search(element.text):
+                continue
+            self.matches[rule.name] += 1
+            html = rule.apply(element)
+            if rule.action != 'extract':
+                break  # Element is gone/replaced; later rules can't see it
+            element.outer_html = html
+
+        self._emit(html)
+
+    # --- Parser Callbacks ---
+    def handle_starttag(self, tag, attrs):
+        self._open(tag, attrs, self.get_starttag_text(), self_closing=False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs, self.get_starttag_text(), self_closing=True)
+
+    def _open(self, tag, attrs, raw, self_closing):
+        attr_map = {k: (v if v is not None else '') for k, v in attrs}
+        matched = [r for r in self.rules if match_selector(r.compounds, tag, attr_map, self.stack)]
+
+        if matched:
+            capture = _Capture(matched, tag, attr_map, len(self.stack))
+            self.captures.append(capture)
+            self._emit(raw)
+            capture.start_len = len(raw)
+        else:
+            self._emit(raw)
+
+        if self_closing or tag in VOID_TAGS:
+            if matched:
+                self._finish_capture()
+        else:
+            self.stack.append((tag, attr_map))
+
+    def handle_endtag(self, tag):
+        # Find the matching open element; stray end tags are passed through untouched
+        idx = len(self.stack) - 1
+        while idx >= 0 and self.stack[idx][0] != tag:
+            idx -= 1
+        if idx < 0:
+            self._emit(f"</{tag}>")
+            return
+
+        # Implicitly close anything left open inside (e.g. unclosed <li>/<p>)
+        while len(self.stack) > idx + 1:
+            self.stack.pop()
+            if self.captures and self.captures[-1].depth == len(self.stack):
+                self._finish_capture()
+
+        self.stack.pop()
+        self._emit(f"</{tag}>")
+        if self.captures and self.captures[-1].depth == idx:
+            self._finish_capture()
+
+    def handle_data(self, data):
+        self._emit(data, text=data)
+
+    # Entity/char refs may or may not end with ';' (e.g. "Q&A 및"), which the callbacks don't
+    # tell us. The raw slice is copied from the buffer when the parser advances past it.
+    def handle_entityref(self, name):
+        self._pending_ref = True
+
+    def handle_charref(self, name):
+        self._pending_ref = True
+
+    def updatepos(self, i, j):
+        if self._pending_ref:
+            self._pending_ref = False
+            raw = self.rawdata[i:j]
+            self._emit(raw, text=raw)
+        return super().updatepos(i, j)
+
+    def handle_comment(self, data):
+        self._emit(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._emit(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self._emit(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self._emit(f"<![{data}]>")
+
+    def close(self):
+        super().close()
+        # Unterminated captured elements are emitted unchanged
+        while self.captures:
+            capture = self.captures.pop()
+            self._emit(''.join(capture.parts))
+
+
+def rewrite_file(path, rules, dry_run=False):
+    """
+    Streams one page through the rules. Output goes to a temp file that replaces the
+    page only if something changed. Returns ({rule_name: match_count}, changed).
+    """
+    tmp_path = path + '.rewrite.tmp'
+
+    with open(path, 'r', encoding='utf-8') as src, open(tmp_path, 'w', encoding='utf-8') as dst:
+        rewriter = StreamingRewriter(rules, dst.write, os.path.basename(path))
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            rewriter.feed(chunk)
+        rewriter.close()
+
+    changed = not filecmp.cmp(path, tmp_path, shallow=False)
+    if changed and not dry_run:
+        os.replace(tmp_path, path)
+    else:
+        os.remove(tmp_path)
+
+    return rewriter.matches, changed
+
+
+def rewrite_pages(rules, pages_dir=PAGES_DIR, pattern='*.html', dry_run=False):
+    """
+    Applies all rules to every page in one pass per page and prints which rules matched.
+    Returns {page: {rule_name: match_count}}.
+    """
+    report = {}
+    for path in sorted(glob.glob(os.path.join(pages_dir, pattern))):
+        matches, changed = rewrite_file(path, rules, dry_run=dry_run)
+        report[os.path.basename(path)] = matches
+        hits = ', '.join(f"{name} x{count}" for name, count in matches.items() if count) or 'no rules matched'
+        status = ('would change' if dry_run else 'updated') if changed else 'unchanged'
+        print(f"  {os.path.basename(path)}: {hits} ({status})")
+
+    # Rules that matched nothing anywhere usually mean the layout changed under them
+    for rule in rules:
+        if not any(page_matches[rule.name] for page_matches in report.values()):
+            print(f"  [!] Rule '{rule.name}' ({rule.selector}) matched nothing")
+
+    return report
+
+
+def main():
+    # Runs every post-processing rule set over pages/ in a single pass per page
+    from fix_lecture import build_rules as part_span_rules
+    from update_lecture_toc import build_rules as toc_rules
+
+    rules = part_span_rules() + toc_rules()
+    print(f"Rewriting pages in {PAGES_DIR}/ with {len(rules)} rules...")
+    rewrite_pages(rules)
+    print("Post-processing complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+/*
+ * Lecture Renderer (data-only delivery)
+ *
+ * Builds a lecture page from the compact JSON written by `convert_lecture.py --data-only`
+ * (pages/lecture{N}.json). The markup must stay byte-identical to the Python templates in
+ * convert_lecture.py -- run `python convert_lecture.py --check-parity` after editing either side.
+ */
+(function (root) {
+    // Keep in sync with CARD_THEMES in convert_lecture.py
+    // (border_color, text_color, icon, bg_hue, title_gradient)
+    const CARD_THEMES = {
+        warning: ["border-rose-600", "text-rose-500", "fa-ban", "bg-rose-900/10", "from-rose-500 to-red-500"],
+        success: ["border-emerald-500", "text-emerald-400", "fa-bullseye", "bg-emerald-900/10", "from-emerald-400 to-green-400"],
+        tip: ["border-blue-500", "text-blue-400", "fa-lightbulb", "bg-blue-900/10", "from-blue-400 to-cyan-400"],
+        tool: ["border-indigo-500", "text-indigo-400", "fa-robot", "bg-indigo-900/10", "from-indigo-400 to-purple-400"],
+        default: ["border-gray-700", "text-gray-300", "fa-cube", "bg-gray-800", "from-gray-200 to-gray-400"]
+    };
+
+    function styleMarks(text, cls) {
+        return text.replace(/<mark>(.*?)<\/mark>/g, `<span class="${cls}">$1</span>`);
+    }
+
+    function styleBolds(text, cls) {
+        return text.replace(/<strong>(.*?)<\/strong>/g, `<span class="${cls}">$1</span>`);
+    }
+
+    // -- Alert Box (Red/Blue block) --
+    function renderAlert(alert) {
+        let bgCls, icon, titCol, textCol;
+        if (alert.warning) {
+            bgCls = "bg-[#7f1d1d] border-red-900";
+            icon = "fa-exclamation-triangle";
+            titCol = "text-white";
+            textCol = "text-red-100";
+        } else {
+            bgCls = "bg-slate-800 border-slate-700";
+            icon = "fa-info-circle";
+            titCol = "text-blue-400";
+            textCol = "text-slate-300";
+        }
+
+        let fullText = "";
+        alert.paragraphs.forEach(p => {
+            let cleaned = styleMarks(p, "font-bold underline Decoration-2");
+            cleaned = styleBolds(cleaned, "font-bold text-white");
+            fullText += `<p class='${textCol} leading-relaxed mb-2 last:mb-0'>${cleaned}</p>`;
+        });
+
+        const idAttr = alert.id ? ` id="${alert.id}"` : '';
+
+        return `
+    <div${idAttr} class="${bgCls} rounded-xl p-8 border mb-10 shadow-lg relative overflow-hidden">
+        <h3 class="text-2xl font-bold ${titCol} mb-4 flex items-center">
+            <i class="fas ${icon} mr-3"></i>${alert.title}
+        </h3>
+        <div class="text-lg">
+            ${fullText}
+        </div>
+    </div>
+    `;
+    }
+
+    // -- Neon Card --
+    function renderCard(card) {
+        const [borderCol, textCol, icon, bgCol] = CARD_THEMES[card.theme];
+        const subtitle = card.role || "";
+        const box = card.box;
+
+        const headerHtml = `
+    <div class="flex items-start mb-6">
+        <div class="w-12 h-12 rounded-lg ${bgCol} ${textCol} flex items-center justify-center text-xl mr-4 flex-shrink-0 border border-current border-opacity-30">
+            <i class="fas ${icon}"></i>
+        </div>
+        <div>
+            <h4 class="text-xl font-bold text-gray-100">${card.title}</h4>
+            ${subtitle ? `<p class="text-sm ${textCol} font-medium mt-1">역할: ${subtitle}</p>` : ''}
+        </div>
+    </div>
+    `;
+
+        const gridCls = box ? "grid grid-cols-1 lg:grid-cols-2 gap-6" : "block";
+
+        let mainHtml = "";
+        if (card.heading) {
+            mainHtml += `<h5 class="text-md font-bold ${textCol} mb-3 flex items-center"><i class="fas fa-thumbtack mr-2 text-xs"></i>${card.heading}</h5>`;
+        }
+        mainHtml += '<ul class="space-y-2 text-gray-400 text-sm leading-relaxed">';
+        card.items.forEach(mi => {
+            mi = styleBolds(mi, "text-gray-200 font-bold");
+            mainHtml += `<li class="flex items-start"><span class="mr-2 mt-1.5 w-1 h-1 rounded-full bg-gray-500 flex-shrink-0"></span><span>${mi}</span></li>`;
+        });
+        mainHtml += '</ul>';
+
+        let boxHtml = "";
+        if (box) {
+            let boxItemsHtml = "";
+            box.items.forEach(bi => {
+                bi = styleBolds(bi, "text-gray-200 font-bold");
+                boxItemsHtml += `<li class="block text-gray-400 mb-2 last:mb-0 text-sm">${bi}</li>`;
+            });
+
+            boxHtml = `
+        <div class="bg-gray-800/80 rounded-lg p-5 border border-gray-700 h-full">
+            <h5 class="text-sm font-bold ${textCol} mb-3 flex items-center">
+                <i class="fas fa-lightbulb mr-2"></i>${box.title}
+            </h5>
+            <ul class="space-y-1">
+                ${boxItemsHtml}
+            </ul>
+        </div>
+        `;
+        }
+
+        return `
+    <div class="bg-[#1e293b] rounded-xl p-6 border ${borderCol} shadow-xl relative overflow-hidden h-full">
+        ${headerHtml}
+        
+        <div class="${gridCls}">
+            <div class="mb-4 lg:mb-0">
+                ${mainHtml}
+            </div>
+            <div>
+                ${boxHtml}
+            </div>
+        </div>
+    </div>
+    `;
+    }
+
+    // -- Compact Card (DOM-budget mode, see render_compact_card_model) --
+    function renderCompactCard(card) {
+        const [borderCol, textCol, icon] = CARD_THEMES[card.theme];
+        const box = card.box;
+
+        let headerHtml = `<h4 class="text-xl font-bold text-gray-100 mb-4"><i class="fas ${icon} ${textCol} mr-3"></i>${card.title}</h4>`;
+        if (card.role) {
+            headerHtml += `<p class="text-sm ${textCol} font-medium -mt-3 mb-4">역할: ${card.role}</p>`;
+        }
+
+        let bodyHtml = "";
+        if (card.heading) {
+            bodyHtml += `<h5 class="text-md font-bold ${textCol} mb-3">${card.heading}</h5>`;
+        }
+        bodyHtml += '<ul class="list-disc pl-5 space-y-2 text-gray-400 text-sm leading-relaxed marker:text-gray-500">';
+        card.items.forEach(mi => {
+            bodyHtml += `<li>${styleBolds(mi, "text-gray-200 font-bold")}</li>`;
+        });
+        bodyHtml += '</ul>';
+
+        if (box) {
+            bodyHtml += `<div class="bg-gray-800/80 rounded-lg p-5 border border-gray-700 mt-4"><h5 class="text-sm font-bold ${textCol} mb-3">${box.title}</h5><ul class="space-y-2 text-gray-400 text-sm">`;
+            box.items.forEach(bi => {
+                bodyHtml += `<li>${styleBolds(bi, "text-gray-200 font-bold")}</li>`;
+            });
+            bodyHtml += '</ul></div>';
+        }
+
+        if (card.collapsed) {
+            const count = card.items.length + (box ? box.items.length : 0);
+            bodyHtml = `<template>${bodyHtml}</template>`
+                + `<button type="button" onclick="expandCard(this)" class="text-sm font-bold ${textCol} hover:underline">자세히 보기 (${count})</button>`;
+        }
+
+        return `<article class="bg-[#1e293b] rounded-xl p-6 border ${borderCol} shadow-xl">${headerHtml}${bodyHtml}</article>`;
+    }
+
+    // -- Compact Section (DOM-budget mode, see render_compact_section_model) --
+    function renderCompactSection(section) {
+        const lazyCls = section.index > 0 ? 'cv-auto ' : '';
+
+        let introHtml = "";
+        section.intro.forEach(lc => {
+            lc = styleMarks(lc, "text-brand font-bold");
+            introHtml += `<p class="text-gray-400 text-lg leading-relaxed mb-6 pl-4 border-l-2 border-gray-700">${lc}</p>`;
+        });
+
+        const innerCards = section.cards.map(renderCompactCard).join('');
+
+        let bodyHtml = `${introHtml}<div class="grid grid-cols-1 md:grid-cols-2 gap-6">${innerCards}</div>`;
+        if (section.collapsed) {
+            bodyHtml = `<template>${bodyHtml}</template>`
+                + `<button type="button" onclick="expandCard(this)" class="text-sm font-bold text-brand hover:underline">펼치기 (카드 ${section.cards.length}개)</button>`;
+        }
+
+        return `<section id="${section.id}" class="${lazyCls}max-w-7xl mx-auto mb-20 pt-10 border-t border-gray-800">`
+            + `<span class="text-xs font-bold text-gray-500 uppercase tracking-widest mb-2 block">Part ${section.index + 1}</span>`
+            + `<h2 class="text-3xl md:text-4xl font-black text-white mb-10 tracking-tight">${section.title}</h2>`
+            + `${bodyHtml}</section>`;
+    }
+
+    // -- Level 1 Section --
+    function renderSection(section) {
+        if (section.type === 'alert') return renderAlert(section);
+        if (section.compact) return renderCompactSection(section);
+
+        let introHtml = "";
+        section.intro.forEach(lc => {
+            lc = styleMarks(lc, "text-brand font-bold");
+            introHtml += `<p class="text-gray-400 text-lg leading-relaxed mb-6 pl-4 border-l-2 border-gray-700">${lc}</p>`;
+        });
+
+        const innerCards = section.cards.map(renderCard).join('');
+
+        return `
+    <section id="${section.id}" class="max-w-7xl mx-auto mb-20 pt-10 border-t border-gray-800">
+        <div class="mb-10">
+            <span class="text-xs font-bold text-gray-500 uppercase tracking-widest mb-2 block">Part ${section.index + 1}</span>
+            <h2 class="text-3xl md:text-4xl font-black text-white mb-4 tracking-tight flex items-center">
+                 ${section.title}
+            </h2>
+        </div>
+        
+        ${introHtml}
+        
+        <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
+            ${innerCards}
+        </div>
+    </section>
+    `;
+    }
+
+    // -- Table of Contents --
+    function renderToc(toc) {
+        let tocHtml = `
+    <div class="bg-white dark:bg-dark-card rounded-2xl p-8 mb-20 shadow-xl border border-gray-100 dark:border-dark-border">
+        <div class="flex items-center justify-between mb-8 border-b border-gray-100 dark:border-gray-800 pb-6">
+            <h3 class="text-2xl font-black text-gray-900 dark:text-gray-100 flex items-center">
+                <i class="fas fa-stream text-brand mr-3"></i>목차 (Table of Contents)
+            </h3>
+        </div>
+        <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
+    `;
+
+        toc.forEach(part => {
+            let sectionsHtml = "";
+            if (!part.sections.length) {
+                sectionsHtml = "<li class='text-xs text-gray-400 italic'>세부 목차 없음 (본문 참조)</li>";
+            } else {
+                part.sections.forEach(sec => {
+                    sectionsHtml += `
+                 <li>
+                    <a href="#${sec.id}" class="flex items-start text-sm text-gray-600 dark:text-gray-400 hover:text-brand dark:hover:text-brand transition-colors py-1">
+                        <span class="mr-2 mt-1.5 w-1.5 h-1.5 rounded-full bg-gray-300 dark:bg-gray-600 flex-shrink-0"></span>
+                        <span class="leading-relaxed hover:underline">${sec.title}</span>
+                    </a>
+                 </li>
+                 `;
+                });
+            }
+
+            tocHtml += `
+        <div class="flex flex-col h-full bg-gray-50 dark:bg-gray-800/50 rounded-xl p-5 border border-gray-100 dark:border-gray-700">
+            <a href="#${part.id}" class="block mb-4 group cursor-pointer">
+                <h4 class="font-black text-lg text-gray-800 dark:text-gray-200 group-hover:text-brand transition-colors mb-1 line-clamp-2">
+                    ${part.title}
+                </h4>
+                <div class="h-1 w-10 bg-gray-200 dark:bg-gray-600 rounded-full group-hover:bg-brand transition-colors"></div>
+            </a>
+            
+            <ul class="space-y-2 flex-1">
+                ${sectionsHtml}
+            </ul>
+        </div>
+        `;
+        });
+
+        tocHtml += `
+        </div>
+    </div>
+    `;
+        return tocHtml;
+    }
+
+    function renderPage(lecture, contentHtml) {
+        return `
+        <!-- Generated Lecture Content -->
+        <div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-12 animate-fade-in-up">
+            <div class="text-center mb-20">
+                <span class="inline-block py-1 px-3 rounded-full bg-indigo-100 dark:bg-indigo-900/30 text-brand text-xs font-bold tracking-wider mb-4 border border-indigo-200 dark:border-indigo-800">PREMIUM CLASS</span>
+                <h1 class="text-4xl md:text-5xl font-black text-gray-900 dark:text-white mb-6 tracking-tight">
+                    정규 강의 <span class="text-transparent bg-clip-text bg-gradient-to-r from-brand to-purple-600">${lecture}강</span>
+                </h1>
+                <p class="text-xl text-gray-500 dark:text-gray-400">AI 워크플로우와 수익화의 핵심을 마스터하세요.</p>
+            </div>
+            
+            ${contentHtml}
+            
+            <div class="mt-20 pt-10 border-t border-gray-200 dark:border-gray-800 text-center">
+                <p class="text-gray-400 text-sm">ShortsToBenz Class • All Rights Reserved</p>
+            </div>
+        </div>
+        `;
+    }
+
+    function renderLecture(model) {
+        if (model.message !== undefined) return renderPage(model.lecture, model.message);
+
+        let contentHtml = renderToc(model.toc);
+        model.blocks.forEach(block => {
+            if (block.type === 'anchor') {
+                contentHtml += `<div id="${block.id}" class="scroll-mt-32"></div>`;
+            } else {
+                contentHtml += renderSection(block);
+            }
+        });
+        return renderPage(model.lecture, contentHtml);
+    }
+
+    const api = { renderLecture };
+    if (typeof module !== 'undefined' && module.exports) {
+        module.exports = api; // Node (parity check)
+    } else {
+        root.LectureRenderer = api;
+    }
+})(this);
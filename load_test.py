@@ -0,0 +1,327 @@
+import os
+import sys
+import time
+import random
+import socket
+import asyncio
+import argparse
+import subprocess
+from collections import defaultdict
+from email.utils import formatdate
+from urllib.parse import urlsplit
+
+from anchor_index import read_inline_json, DELIVERY_SCRIPT_ID
+from prerender import COURSES
+from telemetry_report import percentile
+
+# --- Configuration ---
+PAGES_DIR = 'pages'
+DEFAULT_CONCURRENCY = 50
+DEFAULT_DURATION = 10.0  # Seconds per mode
+SERVER_START_TIMEOUT = 10.0
+REQUEST_TIMEOUT = 10.0
+
+# plain  -> no Accept-Encoding (first visit, no compression)
+# gzip   -> Accept-Encoding: gzip (what browsers send)
+# cached -> gzip + If-Modified-Since from a priming request (revisit with a warm cache, 304)
+MODES = ['plain', 'gzip', 'cached']
+
+# Weighted navigation mix after a live lecture: most of the cohort opens the shell and goes
+# straight to the lecture that just ended; the rest browse other courses or arrive via a
+# shared course-*.html link.
+SHELL_ASSETS = ['/index.html', '/js/lecture_renderer.js']
+NAVIGATION_MIX = [
+    (30, 'spa-lecture', SHELL_ASSETS + ['/pages/home.html', '{lecture1}']),
+    (20, 'spa-lecture', SHELL_ASSETS + ['{lecture2}']),
+    (15, 'spa-home', SHELL_ASSETS + ['/pages/home.html']),
+    (15, 'spa-browse', SHELL_ASSETS + ['/pages/guerrilla1.html', '/pages/shorts_explosion_1.html',
+                                       '/pages/guerrilla_2.html', '/pages/distribution_1.html']),
+    (20, 'prerendered', ['{course}', '/js/lecture_renderer.js']),
+]
+
+
+# --- Navigation Mix ---
+def lecture_path(page, delivery):
+    """ The fragment the SPA fetches for a lecture: its JSON model when delivered as data. """
+    data_path = os.path.join(PAGES_DIR, f"{page}.json")
+    if delivery.get(page) == 'data' and os.path.exists(data_path):
+        return f"/{PAGES_DIR}/{page}.json"
+    return f"/{PAGES_DIR}/{page}.html"
+
+
+def build_flows():
+    """
+    Resolves NAVIGATION_MIX against the tree. Returns [(weight, name, [paths])] with
+    missing files dropped (a flow that loses every path is dropped too).
+    """
+    delivery = read_inline_json(DELIVERY_SCRIPT_ID) or {}
+    courses = [f"/{course['file']}" for course in COURSES]
+    flows = []
+    for weight, name, paths in NAVIGATION_MIX:
+        if '{course}' in paths:
+            # One flow per pre-rendered course, sharing the weight
+            expanded = [[courses[i] if p == '{course}' else p for p in paths] for i in range(len(courses))]
+            share = weight / max(len(courses), 1)
+        else:
+            expanded = [[p.format(lecture1=lecture_path('lecture1', delivery),
+                                  lecture2=lecture_path('lecture2', delivery)) for p in paths]]
+            share = weight
+
+        for flow_paths in expanded:
+            present = []
+            for path in flow_paths:
+                if os.path.isfile(path.lstrip('/')):
+                    present.append(path)
+                else:
+                    print(f"  [!] {path} not found, skipped")
+            if present:
+                flows.append((share, name, present))
+    return flows
+
+
+# --- Server ---
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server():
+    """ Starts dev_server.py on a free port and waits until it accepts connections. """
+    port = free_port()
+    process = subprocess.Popen([sys.executable, 'dev_server.py', str(port), '--quiet'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("dev_server.py exited during startup")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return process, '127.0.0.1', port
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise SystemExit(f"dev_server.py did not start within {SERVER_START_TIMEOUT:.0f}s")
+
+
+# --- HTTP Client ---
+class Connection:
+    """ Minimal keep-alive HTTP/1.1 client (GET only); reconnects when the server closes. """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def get(self, path, headers):
+        """ Returns (status, response headers, bytes on the wire). """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        for line in header_lines:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                response_headers[name.strip().lower()] = value.strip()
+
+        length = int(response_headers.get('content-length', 0))
+        if length:
+            await self.reader.readexactly(length)
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, len(head) + length
+
+
+def request_headers(mode, path, last_modified):
+    headers = {}
+    if mode in ('gzip', 'cached'):
+        headers['Accept-Encoding'] = 'gzip'
+    if mode == 'cached' and path in last_modified:
+        headers['If-Modified-Since'] = last_modified[path]
+    return headers
+
+
+async def prime(host, port, paths):
+    """ Fetches every path once and returns {path: Last-Modified} for the cached mode. """
+    conn = Connection(host, port)
+    last_modified = {}
+    for path in paths:
+        _, headers, _ = await conn.get(path, {'Accept-Encoding': 'gzip'})
+        last_modified[path] = headers.get('last-modified', formatdate(usegmt=True))
+    await conn.close()
+    return last_modified
+
+
+# --- Load ---
+async def virtual_user(user_id, host, port, flows, mode, last_modified, deadline, results, seed):
+    """ Walks weighted flows over one keep-alive connection until the deadline. """
+    rng = random.Random(seed * 100003 + user_id)
+    weights = [weight for weight, _, _ in flows]
+    conn = Connection(host, port)
+    try:
+        while time.monotonic() < deadline:
+            _, _, paths = rng.choices(flows, weights)[0]
+            for path in paths:
+                if time.monotonic() >= deadline:
+                    break
+                start = time.perf_counter()
+                try:
+                    status, _, size = await asyncio.wait_for(
+                        conn.get(path, request_headers(mode, path, last_modified)), REQUEST_TIMEOUT)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+                    results['errors'] += 1
+                    await conn.close()
+                    continue
+                results['routes'][path].append(((time.perf_counter() - start) * 1000, status, size))
+    finally:
+        await conn.close()
+
+
+async def run_mode(host, port, flows, mode, concurrency, duration, last_modified, seed):
+    results = {'routes': defaultdict(list), 'errors': 0}
+    start = time.monotonic()
+    deadline = start + duration
+    await asyncio.gather(*(
+        virtual_user(i, host, port, flows, mode, last_modified, deadline, results, seed)
+        for i in range(concurrency)
+    ))
+    results['elapsed'] = time.monotonic() - start
+    return results
+
+
+# --- Report ---
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def summarize_mode(results):
+    """ Returns (totals, {route: row}) for one mode. """
+    rows = {}
+    total_requests = total_bytes = 0
+    for route, samples in sorted(results['routes'].items()):
+        latencies = sorted(ms for ms, _, _ in samples)
+        statuses = defaultdict(int)
+        for _, status, _ in samples:
+            statuses[status] += 1
+        size = sum(s for _, _, s in samples)
+        rows[route] = {
+            'n': len(samples),
+            'status': ' '.join(f"{code}x{count}" for code, count in sorted(statuses.items())),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'avg_bytes': size / len(samples),
+            'bytes': size,
+        }
+        total_requests += len(samples)
+        total_bytes += size
+
+    elapsed = results['elapsed'] or 1
+    all_latencies = sorted(ms for samples in results['routes'].values() for ms, _, _ in samples)
+    totals = {
+        'requests': total_requests,
+        'rps': total_requests / elapsed,
+        'throughput': total_bytes / elapsed,
+        'bytes': total_bytes,
+        'errors': results['errors'],
+        'p50': percentile(all_latencies, 50),
+        'p95': percentile(all_latencies, 95),
+        'p99': percentile(all_latencies, 99),
+    }
+    return totals, rows
+
+
+def print_mode(mode, totals, rows):
+    print(f"\n=== {mode} ===")
+    print(f"  {totals['requests']} requests, {totals['rps']:.0f} req/s, "
+          f"{format_bytes(totals['throughput'])}/s, {totals['errors']} errors")
+    print(f"  {'route':<36} {'n':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'bytes/req':>11} {'total':>10}  status")
+    for route, row in rows.items():
+        print(f"  {route:<36} {row['n']:>7} {row['p50']:>8.2f} {row['p95']:>8.2f} {row['p99']:>8.2f} "
+              f"{format_bytes(row['avg_bytes']):>11} {format_bytes(row['bytes']):>10}  {row['status']}")
+
+
+def print_comparison(summaries):
+    print("\n=== Comparison ===")
+    print(f"  {'mode':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'bytes/req':>11} {'errors':>7}")
+    for mode, (totals, _) in summaries.items():
+        per_request = totals['bytes'] / (totals['requests'] or 1)
+        p50, p95, p99 = (totals[p] or 0 for p in ('p50', 'p95', 'p99'))
+        print(f"  {mode:<8} {totals['rps']:>8.0f} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f} "
+              f"{format_bytes(per_request):>11} {totals['errors']:>7}")
+
+
+async def run(args, host, port, flows):
+    paths = sorted({path for _, _, flow_paths in flows for path in flow_paths})
+    last_modified = await prime(host, port, paths) if 'cached' in args.modes else {}
+
+    summaries = {}
+    for mode in args.modes:
+        print(f"Running '{mode}' for {args.duration:.0f}s at concurrency {args.concurrency}...")
+        results = await run_mode(host, port, flows, mode, args.concurrency, args.duration, last_modified, args.seed)
+        summaries[mode] = summarize_mode(results)
+        print_mode(mode, *summaries[mode])
+
+    if len(summaries) > 1:
+        print_comparison(summaries)
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a cohort navigation mix against the site and report latency/bytes per route')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Virtual users (one keep-alive connection each)')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help='Seconds per mode')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES, help='Response modes to compare')
+    parser.add_argument('--url', help='Test a running server (e.g. http://127.0.0.1:8000) instead of starting dev_server.py')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the navigation mix')
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    print("Building navigation mix...")
+    flows = build_flows()
+    if not flows:
+        raise SystemExit("No pages found to request.")
+    print(f"  {len(flows)} flows over {len({p for _, _, paths in flows for p in paths})} routes")
+
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        process, host, port = start_server()
+        print(f"  dev_server.py started on port {port}")
+
+    try:
+        summaries = asyncio.run(run(args, host, port, flows))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    if any(totals['errors'] for totals, _ in summaries.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
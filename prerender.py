@@ -0,0 +1,218 @@
+import os
+import re
+import sys
+import json
+import argparse
+from html import escape, unescape
+
+from html_rewriter import Rule, rewrite_file, StreamingRewriter
+from anchor_index import read_inline_json, COURSE_NAV_SCRIPT_ID, DELIVERY_SCRIPT_ID
+
+# --- Configuration ---
+SHELL_PATH = 'index.html'
+PAGES_DIR = 'pages'
+OUTPUT_DIR = '.'  # Next to index.html, so relative asset/fragment URLs keep working
+SITE_NAME = '쇼츠투벤츠 3기'
+CNAME_PATH = 'CNAME'
+SITEMAP_PATH = 'sitemap.xml'
+
+# One standalone document per sidebar course: output file, page fragment, sidebar item, view
+COURSES = [
+    {'file': 'course-free.html', 'page': 'home', 'sidebar': 'sidebar-course-free', 'view': 'home'},
+    {'file': 'course-regular-1.html', 'page': 'lecture1', 'sidebar': 'sidebar-course-regular', 'view': 'lecture'},
+    {'file': 'course-guerrilla-1.html', 'page': 'guerrilla1', 'sidebar': 'sidebar-course-guerrilla-1', 'view': 'lecture'},
+    {'file': 'course-shorts-explosion-1.html', 'page': 'shorts_explosion_1', 'sidebar': 'sidebar-course-shorts-explosion-1', 'view': 'lecture'},
+    {'file': 'course-guerrilla-2.html', 'page': 'guerrilla_2', 'sidebar': 'sidebar-course-guerrilla-2', 'view': 'lecture'},
+    {'file': 'course-distribution-1.html', 'page': 'distribution_1', 'sidebar': 'sidebar-course-distribution-1', 'view': 'lecture'},
+    {'file': 'course-regular-2.html', 'page': 'lecture2', 'sidebar': 'sidebar-course-regular-2', 'view': 'lecture'},
+]
+
+# Same class lists as updateSidebarSelection() in index.html
+SELECTED_CLASSES = ['bg-indigo-50', 'dark:bg-indigo-900/20', 'border-indigo-200', 'dark:border-indigo-800', 'text-brand', 'shadow-sm']
+UNSELECTED_CLASSES = ['hover:bg-gray-50', 'dark:hover:bg-gray-800', 'text-gray-700', 'dark:text-gray-300', 'border-transparent']
+
+NAV_LINK_CLASSES = 'tab-btn pb-4 text-sm font-medium text-gray-500 dark:text-dark-muted hover:text-gray-700 dark:hover:text-gray-200 transition-colors'
+
+
+# --- Markup Helpers ---
+def split_element(element):
+    """ Returns (start_tag, inner_html, end_tag) of a captured element. """
+    outer = element.outer_html
+    start_tag = outer[:outer.index('>') + 1]
+    return start_tag, element.inner_html, outer[len(start_tag) + len(element.inner_html):]
+
+
+def edit_start_tag(start_tag, add=(), remove=(), attrs=None):
+    """ Adds/removes classes and sets attributes on a raw start tag. """
+    match = re.search(r'\sclass="([^"]*)"', start_tag)
+    if match:
+        classes = [c for c in match.group(1).split() if c not in remove]
+        classes += [c for c in add if c not in classes]
+        start_tag = f'{start_tag[:match.start(1)]}{" ".join(classes)}{start_tag[match.end(1):]}'
+    elif add:
+        start_tag = f'{start_tag[:-1]} class="{" ".join(add)}">'
+
+    for name, value in (attrs or {}).items():
+        start_tag = f'{start_tag[:-1]} {name}="{escape(value)}">'
+    return start_tag
+
+
+def render_lecture_nav(tabs):
+    """ Python twin of renderLectureNav() in index.html. """
+    return ''.join(
+        f'<a href="#{target}" class="{NAV_LINK_CLASSES}" data-target="{target}">{label}</a>'
+        for target, label in tabs
+    )
+
+
+def edit_rule(name, selector, inner=None, **edits):
+    """ Replace rule that rewrites an element's start tag and optionally its content. """
+    def replace(element):
+        start_tag, inner_html, end_tag = split_element(element)
+        content = inner(element) if callable(inner) else (inner_html if inner is None else inner)
+        return f"{edit_start_tag(start_tag, **edits)}{content}{end_tag}"
+    return Rule(name, selector, 'replace', replace)
+
+
+# --- Sources ---
+def read_sidebar_titles(path=SHELL_PATH):
+    """ Returns {sidebar item id: course title} from the shell's course list. """
+    rule = Rule('sidebar', '#course-list div[id^="sidebar-course-"]', 'extract')
+    rewrite_file(path, [rule], dry_run=True)
+    titles = {}
+    for _, item in rule.extracted:
+        match = re.search(r'class="text-content">(.*?)</span>', item.inner_html, re.S)
+        if match:
+            titles[item.attrs["id"]] = unescape(match.group(1).strip())
+    return titles
+
+
+def read_page_html(page, delivery):
+    """ Page markup as the SPA would inject it (data-only lectures are rendered from their model). """
+    data_path = os.path.join(PAGES_DIR, f"{page}.json")
+    if delivery.get(page) == 'data' and os.path.exists(data_path):
+        from convert_lecture import render_lecture_model
+        with open(data_path, 'r', encoding='utf-8') as f:
+            return render_lecture_model(json.load(f))
+
+    with open(os.path.join(PAGES_DIR, f"{page}.html"), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+# --- Build ---
+def build_rules(course, title, page_html, nav_tabs):
+    is_home = course['view'] == 'home'
+    show_nav = not is_home and bool(nav_tabs)
+    hidden = ['hidden']
+
+    def sidebar_item(element):
+        start_tag, inner_html, end_tag = split_element(element)
+        if element.attrs.get('id') == course['sidebar']:
+            start_tag = edit_start_tag(start_tag, add=SELECTED_CLASSES, remove=UNSELECTED_CLASSES)
+        else:
+            start_tag = edit_start_tag(start_tag, add=UNSELECTED_CLASSES, remove=SELECTED_CLASSES)
+        return f"{start_tag}{inner_html}{end_tag}"
+
+    return [
+        Rule('title', 'head title', 'replace', f"<title>{escape(SITE_NAME)}: {escape(title)}</title>"),
+        edit_rule('header-title', '#header-title', inner=escape(title)),
+        Rule('sidebar', '#course-list div[id^="sidebar-course-"]', 'replace', sidebar_item),
+        edit_rule('home-nav', 'nav#home-nav', add=[] if is_home else hidden, remove=hidden if is_home else []),
+        edit_rule('lecture-nav', 'nav#lecture-nav', add=[] if show_nav else hidden, remove=hidden if show_nav else []),
+        edit_rule('lecture-nav-links', '#lecture-nav-links', inner=render_lecture_nav(nav_tabs) if show_nav else ''),
+        edit_rule('content-area', '#content-area', attrs={'data-prerendered': course['page']}),
+        edit_rule('home-view', '#home-view', inner=page_html if is_home else '',
+                  add=[] if is_home else hidden, remove=hidden if is_home else []),
+        edit_rule('lecture-view', '#lecture-view', add=hidden if is_home else [], remove=[] if is_home else hidden),
+        edit_rule('lecture-content', '#lecture-content', inner='' if is_home else page_html),
+    ]
+
+
+def prerender_course(course, shell, titles, nav, delivery):
+    """ Streams the shell through the course's rules; returns (output_path, title, html). """
+    title = titles.get(course['sidebar'], course['page'])
+    rules = build_rules(course, title, read_page_html(course['page'], delivery), nav.get(course['page'], []))
+
+    out = []
+    rewriter = StreamingRewriter(rules, out.append, course['file'])
+    rewriter.feed(shell)
+    rewriter.close()
+
+    missing = [rule.name for rule in rules if not rewriter.matches[rule.name]]
+    for name in missing:
+        print(f"  [!] {course['file']}: rule '{name}' matched nothing")
+
+    return os.path.join(OUTPUT_DIR, course['file']), title, ''.join(out)
+
+
+def render_sitemap():
+    """ Lists the shell and every pre-rendered course for crawlers (host from CNAME); None without CNAME. """
+    try:
+        with open(CNAME_PATH, 'r', encoding='utf-8') as f:
+            host = f.read().strip()
+    except OSError:
+        print(f"  [!] {CNAME_PATH} not found, skipping {SITEMAP_PATH}")
+        return None
+
+    urls = [f"https://{host}/"] + [f"https://{host}/{course['file']}" for course in COURSES]
+    entries = ''.join(f"  <url><loc>{escape(url)}</loc></url>\n" for url in urls)
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n{entries}</urlset>\n')
+
+
+def render_outputs():
+    """ Renders every course page and the sitemap in memory; returns [(path, label, content)]. """
+    with open(SHELL_PATH, 'r', encoding='utf-8') as f:
+        shell = f.read()
+
+    titles = read_sidebar_titles()
+    nav = read_inline_json(COURSE_NAV_SCRIPT_ID) or {}
+    delivery = read_inline_json(DELIVERY_SCRIPT_ID) or {}
+    outputs = [prerender_course(course, shell, titles, nav, delivery) for course in COURSES]
+
+    sitemap = render_sitemap()
+    if sitemap is not None:
+        outputs.append((SITEMAP_PATH, f"{sitemap.count('<url>')} URLs", sitemap))
+    return outputs
+
+
+def check_outputs(outputs):
+    """ Compares the rendered outputs with the files on disk; returns the stale paths. """
+    stale = []
+    for path, _, content in outputs:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                current = f.read()
+        except OSError:
+            current = None
+        if current != content:
+            stale.append(path)
+            print(f"  [!] {path}: {'missing' if current is None else 'out of date'}")
+    return stale
+
+
+def main(check=False):
+    if check:
+        # Drift check: the committed pages must match a fresh render of the shell + fragments
+        print("Checking pre-rendered course pages...")
+        stale = check_outputs(render_outputs())
+        if stale:
+            print(f"{len(stale)} file(s) out of date: run `python prerender.py` and commit the result.")
+            sys.exit(1)
+        print("Pre-rendered pages up to date.")
+        return
+
+    print("Pre-rendering standalone course pages...")
+    for path, label, content in render_outputs():
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        size = f"({len(content.encode('utf-8')) / 1024:.1f} KB)" if path != SITEMAP_PATH else ''
+        print(f"  {path}: {label} {size}".rstrip())
+    print("Pre-rendering complete.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Pre-render one standalone HTML document per course (course-*.html, sitemap.xml)')
+    parser.add_argument('--check', action='store_true',
+                        help='Render in memory and exit 1 if any course page or the sitemap differs from the file on disk')
+    main(check=parser.parse_args().check)
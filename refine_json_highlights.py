@@ -3,10 +3,14 @@ import re
 import os
 import glob
 
+from term_stats import GLOSSARY_PATH, TermStats, lecture_key
+
 # Configuration
-DATA_DIR = r'c:\Users\blue2510\자체제작프로그램\ShortsToBenz3\data'
+DATA_DIR = 'data'
+GLOSSARY_TERMS_PER_LECTURE = 15  # Top glossary terms (term_stats.py) highlighted per lecture
+MAX_MARKS_PER_PARAGRAPH = 2      # Only the first occurrence of a term is marked, at most this many per paragraph
 
-# Terms to Highlight (Concepts over Tools)
+# Fallback terms when glossary.json is missing (Concepts over Tools, see TOOL_NAMES in term_stats.py)
 HIGHLIGHT_TERMS = [
     "본질", 
     "생산성", 
@@ -17,7 +21,6 @@ HIGHLIGHT_TERMS = [
     "일관성", 
     "저품질 콘텐츠", 
     "콘텐츠 제작 가이드라인",
-    "클멍", 
     "수익화", 
     "나만의 것",
     "시스템",
@@ -27,11 +30,24 @@ HIGHLIGHT_TERMS = [
     "실행력"
 ]
 
-# Terms specifically NOT to highlight (even if they might match partials, though unlikely for these)
-# We handle this by just not including them in the list.
-# But we must ensure we remove existing marks around "58", "음팔", "오팔", "Opal".
+def load_lecture_terms():
+    """
+    Returns {lecture: [terms]} from the ranked glossary written by term_stats.py,
+    or None if it hasn't been built yet.
+    """
+    try:
+        with open(GLOSSARY_PATH, 'r', encoding='utf-8') as f:
+            glossary = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    lecture_terms = {}
+    for lecture, entries in glossary.items():
+        # Tool names and other non-highlight terms are already left out by term_stats.py
+        lecture_terms[lecture] = [e['term'] for e in entries[:GLOSSARY_TERMS_PER_LECTURE]]
+    return lecture_terms
 
-def clean_and_highlight(text):
+def clean_and_highlight(text, highlight_terms=HIGHLIGHT_TERMS):
     if not isinstance(text, str):
         return text
     
@@ -43,7 +59,7 @@ def clean_and_highlight(text):
     # But simple replacement is usually fine if terms don't overlap.
     
     # Sort terms by length (descending) to handle longer phrases first
-    terms = sorted(HIGHLIGHT_TERMS, key=len, reverse=True)
+    terms = sorted(highlight_terms, key=len, reverse=True)
     
     for term in terms:
         # Regex to match the term, avoiding already marked areas if we were doing complex stuff
@@ -84,10 +100,16 @@ def clean_and_highlight(text):
              pass
              
     # Compile one giant regex for all terms
-    pattern = re.compile('|'.join(re.escape(term) for term in terms))
+    # A term must start a word ("양" never matches inside "다양"); particles may follow it
+    pattern = re.compile(r'(?<![0-9A-Za-z가-힣])(?:' + '|'.join(re.escape(term) for term in terms) + ')')
+    marked = set()
     
     def replace_func(match):
-        return f"<mark>{match.group(0)}</mark>"
+        term = match.group(0)
+        if term in marked or len(marked) >= MAX_MARKS_PER_PARAGRAPH:
+            return term
+        marked.add(term)
+        return f"<mark>{term}</mark>"
         
     # This ensures we process the string once from left to right, finding the longest match (if regex is ordered)
     # Re-compiling pattern with sorted terms ensures longest match wins in standard regex engines usually, 
@@ -97,8 +119,8 @@ def clean_and_highlight(text):
     
     return final_text
 
-def process_file(filepath):
-    print(f"Processing {filepath}...")
+def process_file(filepath, terms=HIGHLIGHT_TERMS):
+    print(f"Processing {filepath} ({len(terms)} terms)...")
     with open(filepath, 'r', encoding='utf-8') as f:
         data = json.load(f)
         
@@ -108,14 +130,14 @@ def process_file(filepath):
             for k, v in obj.items():
                 if isinstance(v, str):
                     if k == 'content' or k == 'title': # Only highlight content and title
-                        obj[k] = clean_and_highlight(v)
+                        obj[k] = clean_and_highlight(v, terms)
                 elif isinstance(v, list):
                      # content is often a list of strings
                     if k == 'content':
                          new_list = []
                          for item in v:
                              if isinstance(item, str):
-                                 new_list.append(clean_and_highlight(item))
+                                 new_list.append(clean_and_highlight(item, terms))
                              else:
                                  new_list.append(item)
                          obj[k] = new_list
@@ -133,9 +155,22 @@ def process_file(filepath):
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 def main():
+    lecture_terms = load_lecture_terms()
+    if lecture_terms is None:
+        print(f"{GLOSSARY_PATH} not found (run term_stats.py); using the fallback HIGHLIGHT_TERMS.")
+
     files = glob.glob(os.path.join(DATA_DIR, '*.json'))
+
+    # term_stats.py keeps ranking on the editor marks this pass is about to replace
+    stats = TermStats()
+    stats.snapshot_editor_marks(files)
+    stats.save()
+
     for f in files:
-        process_file(f)
+        terms = HIGHLIGHT_TERMS
+        if lecture_terms is not None:
+            terms = lecture_terms.get(lecture_key(f)) or HIGHLIGHT_TERMS
+        process_file(f, terms)
     print("All files processed.")
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+import json
+import os
+import hashlib
+from collections import OrderedDict
+
+# --- Configuration ---
+CACHE_DIR = '.render_cache'
+INDEX_FILENAME = 'index.json'
+MAX_CACHE_BYTES = 32 * 1024 * 1024  # 32MB of rendered section HTML
+MAX_CACHE_ENTRIES = 5000
+
+
+def make_cache_key(section_data, index, anchor_id, version):
+    """
+    Builds a stable key from the section JSON, its position, its anchor id and the renderer version.
+    The index and anchor id are part of the key because they end up in the "Part N" label / section id.
+    """
+    payload = json.dumps(section_data, ensure_ascii=False, sort_keys=True)
+    raw = f"{version}\x00{index}\x00{anchor_id}\x00{payload}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class SectionRenderCache:
+    """
+    Persistent on-disk cache of rendered section HTML with size-bounded LRU eviction.
+
+    Layout:
+        .render_cache/index.json   -> LRU order (oldest first) with entry sizes
+        .render_cache/<key>.html   -> rendered HTML for one section
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_entries=MAX_CACHE_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> size in bytes (oldest first)
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self._load_index()
+
+    # --- Index Persistence ---
+    def _index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILENAME)
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.html")
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # Missing or corrupt index -> start empty
+
+        for key, size in data.get('entries', []):
+            # Skip entries whose file disappeared (e.g. manual cleanup)
+            if os.path.exists(self._entry_path(key)):
+                self.entries[key] = size
+                self.total_bytes += size
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._index_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': list(self.entries.items())}, f)
+        os.replace(tmp_path, self._index_path())
+
+    # --- Lookup / Store ---
+    def get(self, key):
+        if key in self.entries:
+            try:
+                with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                    html = f.read()
+            except OSError:
+                self._drop(key)
+            else:
+                self.entries.move_to_end(key)  # Mark as most recently used
+                self.hits += 1
+                return html
+
+        self.misses += 1
+        return None
+
+    def put(self, key, html):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._entry_path(key), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+        size = len(html.encode('utf-8'))
+        if key in self.entries:
+            self.total_bytes -= self.entries[key]
+        self.entries[key] = size
+        self.entries.move_to_end(key)
+        self.total_bytes += size
+        self.writes += 1
+
+        self._evict()
+
+    def _drop(self, key):
+        self.total_bytes -= self.entries.pop(key, 0)
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        # Evict least recently used entries until both limits are satisfied
+        while self.entries and (self.total_bytes > self.max_bytes or len(self.entries) > self.max_entries):
+            oldest_key = next(iter(self.entries))
+            self._drop(oldest_key)
+            self.evictions += 1
+
+    def clear(self):
+        for key in list(self.entries):
+            self._drop(key)
+        self.save()
+
+    # --- Statistics ---
+    def summary(self):
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        return (
+            f"Render cache: {self.hits} hits / {self.misses} misses ({hit_rate:.1f}% hit rate), "
+            f"{self.writes} written, {self.evictions} evicted, "
+            f"{len(self.entries)} entries ({self.total_bytes / 1024:.1f} KB)"
+        )
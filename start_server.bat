@@ -1,6 +1,7 @@
 @echo off
 echo Starting local web server...
 echo Please open your browser to http://localhost:8000/index.html
+echo (add ?telemetry=1 once to record performance telemetry)
 cd /d "%~dp0"
-python -m http.server 8000
+python dev_server.py 8000
 pause
@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+from collections import defaultdict
+
+from dev_server import TELEMETRY_FILE
+
+# --- Configuration ---
+# Metrics summarized per (event type, page)
+METRICS = {
+    'navigation': ['ttfb', 'domContentLoaded', 'fcp', 'load', 'bytes'],
+    'page': ['fetch', 'parse', 'nodes', 'bytes'],
+    'init': ['duration'],
+}
+
+
+def percentile(values, pct):
+    """ Linear-interpolation percentile of an already sorted list. """
+    if not values:
+        return None
+    pos = (len(values) - 1) * pct / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
+
+
+def load_events(path):
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue  # Truncated line from an interrupted write
+    return events
+
+
+def summarize(events):
+    """ Returns {(type, page): {metric: sorted values}}. """
+    groups = defaultdict(lambda: defaultdict(list))
+    for event in events:
+        metrics = METRICS.get(event.get('type'))
+        if not metrics:
+            continue
+        key = (event['type'], event.get('page', '?'))
+        for metric in metrics:
+            value = event.get(metric)
+            if isinstance(value, (int, float)):
+                groups[key][metric].append(value)
+    return {key: {m: sorted(v) for m, v in metrics.items()} for key, metrics in groups.items()}
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else TELEMETRY_FILE
+    if not os.path.exists(path):
+        print(f"No telemetry found at {path}. Run dev_server.py and browse the site first.")
+        return
+
+    events = load_events(path)
+    sessions = {e.get('session') for e in events}
+    print(f"{len(events)} events from {len(sessions)} sessions ({path})\n")
+
+    summary = summarize(events)
+    print(f"{'type':<11} {'page':<20} {'metric':<17} {'n':>5} {'p50':>10} {'p95':>10} {'max':>10}")
+    print('-' * 88)
+    for (event_type, page), metrics in sorted(summary.items()):
+        for metric, values in metrics.items():
+            print(
+                f"{event_type:<11} {page:<20} {metric:<17} {len(values):>5} "
+                f"{percentile(values, 50):>10.1f} {percentile(values, 95):>10.1f} {values[-1]:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+import os
+import re
+import json
+import glob
+import math
+import hashlib
+import argparse
+from collections import Counter
+
+# --- Configuration ---
+DATA_DIR = 'data'
+CACHE_PATH = os.path.join('.term_stats', 'stats.json')
+GLOSSARY_PATH = 'glossary.json'
+STATS_VERSION = 3  # Bump when tokenization or the cache layout changes; invalidates the cache
+
+MAX_NGRAM = 3
+GLOSSARY_SIZE = 30     # Terms proposed per lecture
+MIN_TERM_FREQ = 3      # Occurrences within a lecture before a term is considered
+MARK_WEIGHT = 2.0      # Boost for terms editors put inside <mark>
+COOCCUR_WEIGHT = 0.5   # Boost for terms sharing a paragraph with a <mark>
+IDF_FLOOR = 0.2        # Terms used in every lecture still rank if editors mark them
+EDITOR_MARK_RATIO = 0.05  # Share of a term's uses editors marked before it counts as editor-chosen
+MAX_UNMARKED_DF = 0.5     # Terms that aren't editor-chosen are dropped above this share of lectures
+SUBSUME_RATIO = 0.8    # Drop "AI" if "AI 워크플로우" covers 80%+ of its occurrences
+
+# Trailing particles (조사) stripped from tokens: "대본을" -> "대본"
+PARTICLES = sorted([
+    '으로', '에서', '에게', '까지', '부터', '처럼', '보다', '이라', '라고', '이나', '이랑', '하고',
+    '은', '는', '이', '가', '을', '를', '의', '에', '와', '과', '도', '로', '만', '랑',
+], key=len, reverse=True)
+
+# Tokens ending like this are predicates, not terms
+VERB_ENDINGS = (
+    '니다', '니까', '는다', '하는', '하여', '해서', '하고', '하면', '되는', '있는', '없는', '같은',
+    '여야', '어야', '아야', '와서', '어서', '아서', '워서',
+    '이다', '였다', '했다', '한다', '된다', '하게', '되어', '있다', '없다', '해야', '하지', '어요', '세요',
+)
+
+STOPWORDS = {
+    '그리고', '그래서', '하지만', '그러나', '그런데', '이런', '저런', '그런', '이것', '그것', '저것', '우리',
+    '여러분', '정말', '진짜', '이제', '지금', '그냥', '많이', '너무', '이렇게', '그렇게', '어떻게', '무엇',
+    '때문', '위해', '통해', '대한', '대해', '경우', '가장', '어떤', '같은', '다른', '모든', '또한', '바로',
+    '다시', '먼저', '계속', '이후', '이번', '다음', '하나', '부분', '정도', '내용', '방법', '사람', '생각',
+    '강의', '무엇인가', '무엇인지', '있도록', '가지', '자신', '매우', '특히', '함께', '어느', '아니라',
+    '것이', '것은', '것을', '것도', '것으로', '현재', '실제', '필요', '중요', '오늘', '나중에', '해당', '주어',
+    '버전', '경계', '꼬리',
+}
+
+# Tool names are never highlighted (concepts over tools); as stopwords they also never join a phrase
+TOOL_NAMES = {
+    '음팔', '오팔', 'Opal', '클로드', '젠스파크', '그록', '하이캐스트', 'Typecast', '캡컷', '브루', '클멍', '클링',
+}
+
+# Terms kept inside phrases ("AI 워크플로우") but not highlighted on their own
+EXCLUDE_TERMS = {'AI'}
+
+# Particle stripping can leave a verb stem ("유통하는" -> "유통하")
+STEM_ENDINGS = ('하', '되', '했', '된', '할', '한')
+
+# Connective verb forms that survive as tokens ("늘려", "바꿔")
+CONNECTIVE_ENDINGS = ('려', '워', '져', '춰', '켜', '쳐', '혀', '겨', '봐', '줘', '꿔')
+
+# Particles left on two-syllable tokens, which normalize_token won't strip ("양을")
+SHORT_PARTICLES = ('을', '를', '은', '는', '의')
+
+MARK_PATTERN = re.compile(r'<mark>(.*?)</mark>', re.S)
+INLINE_TAG_PATTERN = re.compile(r'</?(?:mark|strong)>')  # Removed without a gap: "<mark>대본</mark>을" -> "대본을"
+TAG_PATTERN = re.compile(r'<[^>]+>|<<.*?>>|\*\*|https?://\S+|!\[[^\]]*\]\([^)]*\)')
+TOKEN_PATTERN = re.compile(r'[0-9A-Za-z가-힣]+')
+
+
+# --- Tokenization ---
+def lecture_key(path):
+    """ Groups part files of one lecture: '정규강의 1강 2부 ...' -> '정규강의 1강'. """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = re.match(r'^(.*?\d+강)\s*\d+부', stem)
+    return match.group(1) if match else stem
+
+
+def normalize_token(token):
+    for particle in PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 2:
+            return token[:-len(particle)]
+    return token
+
+
+def is_term_token(token):
+    return (
+        len(token) >= 2
+        and not token[0].isdigit()  # Numbers and counters: "100개", "4대"
+        and token not in STOPWORDS
+        and token not in TOOL_NAMES
+        and not token.endswith(VERB_ENDINGS)
+        and not token.endswith(STEM_ENDINGS)
+        and not token.endswith(CONNECTIVE_ENDINGS)
+        and not (len(token) == 2 and token.endswith(SHORT_PARTICLES))
+    )
+
+
+def extract_ngrams(text):
+    """
+    Counts 1..MAX_NGRAM-grams of term tokens; n-grams never span a non-term token.
+    Phrases are only counted where they appear verbatim: particle stripping turns
+    "나만의 콘텐츠" into "나만 콘텐츠", which could never be highlighted.
+    """
+    counts = Counter()
+    plain = TAG_PATTERN.sub(' ', INLINE_TAG_PATTERN.sub('', text))
+    tokens = [normalize_token(t) for t in TOKEN_PATTERN.findall(plain)]
+    run = []
+    for token in tokens + ['']:
+        if is_term_token(token):
+            run.append(token)
+            continue
+        for n in range(1, MAX_NGRAM + 1):
+            for i in range(len(run) - n + 1):
+                phrase = ' '.join(run[i:i + n])
+                if n == 1 or phrase in plain:
+                    counts[phrase] += 1
+        run = []
+    return counts
+
+
+def iter_paragraphs(data):
+    """ Yields every title/content string of a lecture JSON file. """
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in ('title', 'content') and isinstance(value, str):
+                yield value
+            elif key == 'content' and isinstance(value, list):
+                for item in value:
+                    if isinstance(item, str):
+                        yield item
+                    else:
+                        yield from iter_paragraphs(item)
+            elif isinstance(value, (dict, list)):
+                yield from iter_paragraphs(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_paragraphs(item)
+
+
+def scan_file(path):
+    """
+    Per-file statistics:
+        counts  -> n-gram occurrences
+        marked  -> occurrences inside editor <mark> spans
+        cooccur -> occurrences in paragraphs that contain a <mark>
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    counts, marked, cooccur = Counter(), Counter(), Counter()
+    for paragraph in iter_paragraphs(data):
+        paragraph_counts = extract_ngrams(paragraph)
+        counts.update(paragraph_counts)
+
+        marks = MARK_PATTERN.findall(paragraph)
+        if marks:
+            cooccur.update(paragraph_counts)
+            for mark in marks:
+                marked.update(extract_ngrams(mark))
+
+    return {'counts': dict(counts), 'marked': dict(marked), 'cooccur': dict(cooccur)}
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# --- Corpus Statistics ---
+class TermStats:
+    """
+    Corpus-wide n-gram statistics, kept up to date incrementally: when a file changes only
+    its old counts are subtracted and its new counts added, instead of rescanning the corpus.
+
+    The mark signals come from the editor marks a file had when it was first seen.
+    refine_json_highlights.py replaces those marks with glossary terms, so rescanning them
+    afterwards would just feed the glossary back into itself.
+
+    Layout (.term_stats/stats.json):
+        files    -> {path: {'hash', 'lecture', 'counts', 'marked', 'cooccur'}}
+        lectures -> {lecture: {'counts', 'marked', 'cooccur'}}   (sums of its files)
+        df       -> {term: number of lectures containing it}
+        editor   -> {path: {'marked', 'cooccur'}}   (editor mark snapshot per file)
+    """
+
+    def __init__(self, cache_path=CACHE_PATH):
+        self.cache_path = cache_path
+        self.files = {}
+        self.lectures = {}
+        self.df = Counter()
+        self.editor = {}
+        self.scanned = 0
+        self.removed = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # Missing or corrupt cache -> full scan
+        self.editor = data.get('editor', {})  # The snapshot outlives format changes
+        if data.get('version') != STATS_VERSION:
+            return
+
+        self.files = data['files']
+        self.lectures = {
+            lecture: {kind: Counter(values) for kind, values in stats.items()}
+            for lecture, stats in data['lectures'].items()
+        }
+        self.df = Counter(data['df'])
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': STATS_VERSION,
+                'files': self.files,
+                'lectures': {lecture: {k: dict(v) for k, v in stats.items()} for lecture, stats in self.lectures.items()},
+                'df': dict(self.df),
+                'editor': self.editor,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def _apply(self, lecture, entry, sign):
+        """ Adds (sign=1) or subtracts (sign=-1) one file's counts from its lecture and df. """
+        stats = self.lectures.setdefault(lecture, {'counts': Counter(), 'marked': Counter(), 'cooccur': Counter()})
+        for kind in ('counts', 'marked', 'cooccur'):
+            target = stats[kind]
+            for term, count in entry[kind].items():
+                before = target[term]
+                target[term] = before + sign * count
+                if target[term] <= 0:
+                    del target[term]
+                # Document frequency changes only when a term appears in / disappears from a lecture
+                if kind == 'counts':
+                    if before == 0 and target[term] > 0:
+                        self.df[term] += 1
+                    elif before > 0 and term not in target:
+                        self.df[term] -= 1
+                        if self.df[term] <= 0:
+                            del self.df[term]
+        if not stats['counts']:
+            del self.lectures[lecture]
+
+    def reset(self):
+        """ Forgets all counts (full rescan on the next update) but keeps the editor mark snapshot. """
+        self.files = {}
+        self.lectures = {}
+        self.df = Counter()
+
+    def snapshot_editor_marks(self, paths):
+        """ Records the marks of files not seen before; call before anything rewrites them. """
+        for path in paths:
+            if path not in self.editor:
+                entry = scan_file(path)
+                self.editor[path] = {'marked': entry['marked'], 'cooccur': entry['cooccur']}
+
+    def update(self, paths):
+        """ Rescans only new/changed files and drops files that no longer exist. """
+        current = set(paths)
+        for path in [p for p in self.files if p not in current]:
+            entry = self.files.pop(path)
+            self._apply(entry['lecture'], entry, -1)
+            self.editor.pop(path, None)
+            self.removed += 1
+
+        for path in sorted(paths):
+            digest = file_hash(path)
+            old = self.files.get(path)
+            if old and old['hash'] == digest:
+                continue
+            if old:
+                self._apply(old['lecture'], old, -1)
+
+            entry = scan_file(path)
+            if path in self.editor:
+                entry.update(self.editor[path])
+            else:
+                self.editor[path] = {'marked': entry['marked'], 'cooccur': entry['cooccur']}
+            entry['hash'] = digest
+            entry['lecture'] = lecture_key(path)
+            self._apply(entry['lecture'], entry, 1)
+            self.files[path] = entry
+            self.scanned += 1
+
+    # --- Ranking ---
+    def corpus_totals(self, kind):
+        totals = Counter()
+        for stats in self.lectures.values():
+            totals.update(stats[kind])
+        return totals
+
+    def glossary(self, lecture, size=GLOSSARY_SIZE):
+        """
+        Ranks the lecture's terms by TF-IDF, boosted by how often editors marked the term
+        (corpus-wide) and how often it shares a paragraph with a mark in this lecture.
+        """
+        stats = self.lectures[lecture]
+        counts = stats['counts']
+        total_terms = sum(c for term, c in counts.items() if ' ' not in term) or 1
+        num_lectures = len(self.lectures)
+        corpus_counts = self.corpus_totals('counts')
+        corpus_marked = self.corpus_totals('marked')
+
+        scored = []
+        for term, tf in counts.items():
+            if tf < MIN_TERM_FREQ or term in EXCLUDE_TERMS:
+                continue
+            # Generic words ("영상", "제작") only stay if editors actually mark them
+            mark_ratio = corpus_marked[term] / corpus_counts[term]
+            idf = math.log((1 + num_lectures) / (1 + self.df[term]))
+            if mark_ratio >= EDITOR_MARK_RATIO:
+                idf += IDF_FLOOR
+            elif self.df[term] > MAX_UNMARKED_DF * num_lectures:
+                continue
+            if idf <= 0:
+                continue
+            cooccur_ratio = stats['cooccur'].get(term, 0) / tf
+            score = (tf / total_terms) * idf * (1 + MARK_WEIGHT * mark_ratio + COOCCUR_WEIGHT * cooccur_ratio)
+            scored.append((score, term, tf, mark_ratio))
+
+        # A phrase that accounts for most uses of its parts replaces them
+        kept = []
+        for score, term, tf, mark_ratio in sorted(scored, key=lambda x: (-len(x[1].split()), -x[0], x[1])):
+            if any(f" {term} " in f" {longer} " and longer_tf >= SUBSUME_RATIO * tf for longer, longer_tf in kept):
+                continue
+            kept.append((term, tf))
+        kept_terms = {term for term, _ in kept}
+
+        ranked = sorted((s for s in scored if s[1] in kept_terms), key=lambda x: (-x[0], x[1]))[:size]
+        return [
+            {'term': term, 'score': round(score * 1000, 3), 'tf': tf, 'df': self.df[term], 'marked': round(mark_ratio, 3)}
+            for score, term, tf, mark_ratio in ranked
+        ]
+
+
+def build_glossary(stats):
+    return {lecture: stats.glossary(lecture) for lecture in sorted(stats.lectures)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank highlight terms per lecture from corpus n-gram statistics')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the incremental counts and rescan every file')
+    parser.add_argument('--show', type=int, default=10, help='Terms to print per lecture')
+    args = parser.parse_args()
+
+    stats = TermStats()
+    if args.rebuild:
+        stats.reset()
+    stats.update(glob.glob(os.path.join(DATA_DIR, '*.json')))
+    stats.save()
+    print(f"Term stats: {stats.scanned} files scanned, {len(stats.files) - stats.scanned} unchanged, "
+          f"{stats.removed} removed; {len(stats.lectures)} lectures, {len(stats.df)} distinct n-grams")
+
+    glossary = build_glossary(stats)
+    with open(GLOSSARY_PATH, 'w', encoding='utf-8') as f:
+        json.dump(glossary, f, ensure_ascii=False, indent=2)
+
+    for lecture, terms in glossary.items():
+        print(f"  {lecture}: {', '.join(t['term'] for t in terms[:args.show])}")
+    print(f"Created {GLOSSARY_PATH}")
+
+
+if __name__ == "__main__":
+    main()